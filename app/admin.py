@@ -1,9 +1,174 @@
-from django.contrib import admin
-from .models import Incident
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 
-admin.site.register(Incident)
+from .changes import record_changes
+from .derived import affected_months, refresh_derived_data
+from .geo import grid_cell, normalize_coordinates
+from .models import (
+    ApiToken,
+    ArchivedIncident,
+    HotspotCount,
+    Incident,
+    IncidentChange,
+    Job,
+    Region,
+)
 
 
-# class IncidentAdmin(admin.ModelAdmin):
-#     list_display = ("datetime", "location", "latitude", "longitude", "number_affected")
-#     list_editable = ("latitude", "longitude")
+class CappedCountPaginator(Paginator):
+    """Paginator that never runs an unbounded COUNT(*) over the incidents table.
+
+    Unfiltered changelists on PostgreSQL use the planner's row estimate; every
+    other count stops at `count_cap` rows, which is enough to page through
+    while filters narrow the results down.
+    """
+
+    count_cap = 10000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if connection.vendor == "postgresql" and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.count_cap:
+                return row[0]
+        return self.object_list[: self.count_cap + 1].count()
+
+
+@admin.register(Region)
+class RegionAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "center_latitude", "center_longitude", "zoom")
+    prepopulated_fields = {"slug": ("name",)}
+
+
+@admin.register(Incident)
+class IncidentAdmin(admin.ModelAdmin):
+    list_display = (
+        "datetime",
+        "region",
+        "location",
+        "number_affected",
+        "narcan_doses_administered",
+        "fatal_incident",
+        "coordinates",
+    )
+    list_filter = ("region", "fatal_incident")
+    date_hierarchy = "datetime"
+    # case-insensitive prefix searches only, served on PostgreSQL by the
+    # UPPER(location) pattern-ops index from migration 0021; pages still walk
+    # the datetime index newest first
+    search_fields = ("location__istartswith",)
+    ordering = ("-datetime", "-id")
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+    actions = ("mark_fatal", "recompute_coordinates", "refresh_derived_stats")
+
+    @admin.action(description="Mark selected incidents as fatal")
+    def mark_fatal(self, request, queryset):
+        months = affected_months(queryset)
+        incident_ids = list(
+            queryset.filter(fatal_incident=False).values_list("id", flat=True)
+        )
+        updated = Incident.objects.filter(id__in=incident_ids).update(
+            fatal_incident=True
+        )
+        record_changes(IncidentChange.UPDATE, incident_ids)
+        refresh_derived_data(months)
+        self.message_user(request, f"Marked {updated} incidents as fatal")
+
+    @admin.action(description="Recompute coordinates for selected incidents")
+    def recompute_coordinates(self, request, queryset):
+        changed = []
+        skipped = 0
+        for incident_id, region_id, coordinates in queryset.exclude(
+            coordinates__isnull=True
+        ).values_list("id", "region_id", "coordinates").iterator():
+            normalized = normalize_coordinates(coordinates)
+            if normalized is None:
+                # keep what was entered rather than blanking it
+                skipped += 1
+            elif normalized != coordinates:
+                changed.append(
+                    Incident(
+                        id=incident_id,
+                        region_id=region_id,
+                        coordinates=normalized,
+                        grid_cell=grid_cell(normalized),
+                    )
+                )
+        Incident.objects.bulk_update(
+            changed, ["coordinates", "grid_cell"], batch_size=500
+        )
+        record_changes(IncidentChange.UPDATE, [incident.id for incident in changed])
+        # the cached maps for these months still show the old positions
+        refresh_derived_data(affected_months(queryset))
+        message = f"Normalized coordinates on {len(changed)} incidents"
+        if skipped:
+            message += f"; left {skipped} with unparseable coordinates unchanged"
+        self.message_user(request, message)
+
+    @admin.action(description="Recompute derived statistics for selected months")
+    def refresh_derived_stats(self, request, queryset):
+        months = affected_months(queryset)
+        refresh_derived_data(months)
+        self.message_user(
+            request, f"Refreshed derived data for {len(months)} months", messages.SUCCESS
+        )
+
+
+@admin.register(ArchivedIncident)
+class ArchivedIncidentAdmin(admin.ModelAdmin):
+    list_display = (
+        "datetime",
+        "location",
+        "number_affected",
+        "fatal_incident",
+        "archived_at",
+    )
+    list_filter = ("region", "fatal_incident")
+    date_hierarchy = "datetime"
+    search_fields = ("location__istartswith",)
+    ordering = ("-datetime", "-id")
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+
+    # archived rows are history; edits go through the hot table only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(HotspotCount)
+class HotspotCountAdmin(admin.ModelAdmin):
+    list_display = ("label", "kind", "month", "incident_count", "fatal_count")
+    list_filter = ("region", "kind")
+    date_hierarchy = "month"
+    search_fields = ("key__istartswith",)
+    ordering = ("-month", "-incident_count")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "key", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("status", "kind")
+    ordering = ("-id",)
+    readonly_fields = ("last_error",)
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ("name", "user", "is_active", "created_at", "last_used_at")
+    list_filter = ("is_active",)
+    readonly_fields = ("key", "created_at", "last_used_at")
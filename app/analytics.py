@@ -0,0 +1,194 @@
+"""Offline correlation and cross-tab reports, built by `manage.py analytics_report`.
+
+Incidents are exported a month at a time and summarized in a process pool
+into mergeable partials (hour x weekday counts, per-location counts,
+fatality by narcan doses and pairwise moment sums for correlations). The
+partials are stored as Parquet per month, so an incremental run only
+redoes months whose `MonthIndex` row changed since the last run, then
+merges everything into the final reports and the `AnalyticsSummary` table
+the dashboard reads. The dashboard caches that table under its newest
+`computed_at`, so a report written by another process shows up at once.
+
+pandas and pyarrow are only needed to build the reports, not to read the
+summary table.
+"""
+
+import calendar
+import json
+import multiprocessing
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import AnalyticsSummary, MonthIndex
+from .month_index import month_bounds
+from .storage import incident_querysets
+
+try:
+    import pandas as pd
+
+    from .analytics_partials import EXPORT_COLUMNS, summarize_month
+except ImportError:  # reports are optional; the summary table works without them
+    pd = None
+
+PARTIALS = ["hour_weekday", "location_month", "fatal_by_narcan", "moments"]
+SUMMARY_CACHE_KEY = "analytics_summary"
+SUMMARY_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def get_analytics_dir():
+    return Path(getattr(settings, "ANALYTICS_DIR", settings.BASE_DIR / "analytics"))
+
+
+def export_month(month, chunk_size):
+    start, end = month_bounds(month)
+    rows = []
+    for queryset in incident_querysets(start, datetime__lt=end):
+        rows.extend(
+            queryset.values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+        )
+    return rows
+
+
+def correlations_from_moments(moments):
+    totals = moments.groupby(["a", "b"], as_index=False).sum(numeric_only=True)
+    results = []
+    for row in totals.itertuples(index=False):
+        variance_a = row.n * row.sum_aa - row.sum_a**2
+        variance_b = row.n * row.sum_bb - row.sum_b**2
+        denominator = (variance_a * variance_b) ** 0.5
+        results.append(
+            {
+                "a": row.a,
+                "b": row.b,
+                "n": int(row.n),
+                "r": (
+                    (row.n * row.sum_ab - row.sum_a * row.sum_b) / denominator
+                    if denominator
+                    else None
+                ),
+            }
+        )
+    return pd.DataFrame(results, columns=["a", "b", "n", "r"])
+
+
+def build_reports(output_dir, workers=None, full=False, chunk_size=2000):
+    if pd is None:
+        raise RuntimeError("analytics reports need pandas and pyarrow installed")
+    output_dir = Path(output_dir)
+    partials_dir = output_dir / "partials"
+    manifest_path = output_dir / "manifest.json"
+    if full and partials_dir.exists():
+        shutil.rmtree(partials_dir)
+    partials_dir.mkdir(parents=True, exist_ok=True)
+    manifest = (
+        json.loads(manifest_path.read_text())
+        if manifest_path.exists() and not full
+        else {}
+    )
+
+    # reports cover every region; a month's version is its latest refresh in any
+    months, versions = {}, {}
+    for entry in MonthIndex.objects.all():
+        month = entry.month.strftime("%Y-%m")
+        months[month] = entry.month
+        versions[month] = max(versions.get(month, ""), entry.updated_at.isoformat())
+    for month in set(manifest) - set(versions):
+        shutil.rmtree(partials_dir / month, ignore_errors=True)
+        del manifest[month]
+    changed = sorted(
+        month for month, version in versions.items() if manifest.get(month) != version
+    )
+
+    # spawned rather than forked, so workers never share the database connection
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = {}
+        for month in changed:
+            rows = export_month(months[month], chunk_size)
+            futures[month] = pool.submit(summarize_month, month, rows)
+        for month, future in futures.items():
+            month_dir = partials_dir / month
+            month_dir.mkdir(exist_ok=True)
+            for name, frame in future.result().items():
+                frame.to_parquet(month_dir / f"{name}.parquet", index=False)
+            manifest[month] = versions[month]
+
+    combined = {}
+    for name in PARTIALS:
+        paths = sorted(partials_dir.glob(f"*/{name}.parquet"))
+        combined[name] = (
+            pd.concat([pd.read_parquet(path) for path in paths])
+            if paths
+            else pd.DataFrame()
+        )
+    reports = {}
+    if not combined["hour_weekday"].empty:
+        reports["hour_weekday"] = combined["hour_weekday"].groupby(
+            ["weekday", "hour"], as_index=False
+        ).sum()
+        reports["location_month"] = combined["location_month"].sort_values(
+            ["month", "location"]
+        )
+        reports["fatal_by_narcan"] = combined["fatal_by_narcan"].groupby(
+            ["narcan", "fatal"], as_index=False
+        ).sum()
+        reports["correlation"] = correlations_from_moments(combined["moments"])
+    for name, frame in reports.items():
+        frame.to_parquet(output_dir / f"{name}.parquet", index=False)
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    write_summary(reports)
+    return {"processed_months": changed, "total_months": len(versions)}
+
+
+def write_summary(reports):
+    summaries = {}
+    if reports:
+        for row in reports["correlation"].itertuples(index=False):
+            summaries[f"correlation_{row.a}_{row.b}"] = (
+                None if pd.isna(row.r) else float(row.r),
+                {"n": row.n},
+            )
+        peak = reports["hour_weekday"].sort_values("incidents").iloc[-1]
+        summaries["peak_hour_weekday"] = (
+            float(peak["incidents"]),
+            {
+                "weekday": calendar.day_name[int(peak["weekday"])],
+                "hour": int(peak["hour"]),
+            },
+        )
+        locations = reports["location_month"].groupby("location")["incidents"].sum()
+        summaries["top_location"] = (
+            float(locations.max()),
+            {"location": locations.idxmax()},
+        )
+    AnalyticsSummary.objects.exclude(metric__in=summaries).delete()
+    for metric, (value, detail) in summaries.items():
+        AnalyticsSummary.objects.update_or_create(
+            metric=metric, defaults={"value": value, "detail": detail}
+        )
+
+
+def get_summary_version():
+    """A token that changes whenever a report run writes or removes a summary row."""
+    latest = AnalyticsSummary.objects.aggregate(
+        count=Count("id"), computed_at=Max("computed_at")
+    )
+    if not latest["count"]:
+        return "empty"
+    return f"{latest['count']}-{latest['computed_at'].isoformat()}"
+
+
+def get_analytics_summary():
+    key = f"{SUMMARY_CACHE_KEY}:{get_summary_version()}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = {entry.metric: entry for entry in AnalyticsSummary.objects.all()}
+        cache.set(key, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
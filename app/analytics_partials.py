@@ -0,0 +1,67 @@
+"""Per-month partial reports, computed in `analytics_report`'s worker processes.
+
+Kept free of Django imports so spawned workers can load it without
+setting Django up.
+"""
+
+from itertools import combinations
+
+import pandas as pd
+
+EXPORT_COLUMNS = [
+    "datetime",
+    "location",
+    "number_affected",
+    "narcan_doses_administered",
+    "fatal_incident",
+]
+CORRELATED_COLUMNS = ["fatal", "number_affected", "narcan"]
+
+
+def summarize_month(month, rows):
+    """Reduce one month of exported rows to its partial reports (runs in a worker)."""
+    frame = pd.DataFrame.from_records(rows, columns=EXPORT_COLUMNS)
+    timestamps = pd.to_datetime(frame["datetime"])
+    frame["hour"] = timestamps.dt.hour
+    frame["weekday"] = timestamps.dt.dayofweek
+    frame["fatal"] = frame["fatal_incident"].astype(int)
+    frame["narcan"] = pd.to_numeric(frame["narcan_doses_administered"], errors="coerce")
+
+    aggregations = {
+        "incidents": ("fatal", "size"),
+        "affected": ("number_affected", "sum"),
+        "fatal": ("fatal", "sum"),
+    }
+    hour_weekday = frame.groupby(["weekday", "hour"]).agg(**aggregations).reset_index()
+    location_month = frame.groupby("location").agg(**aggregations).reset_index()
+    location_month.insert(0, "month", month)
+    fatal_by_narcan = (
+        frame.assign(narcan=frame["narcan"].fillna(-1).astype(int))
+        .groupby(["narcan", "fatal"])
+        .size()
+        .reset_index(name="incidents")
+    )
+
+    # raw sums rather than coefficients, so months can simply be added together
+    moments = []
+    for a, b in combinations(CORRELATED_COLUMNS, 2):
+        pair = frame[[a, b]].dropna().astype(float)
+        moments.append(
+            {
+                "a": a,
+                "b": b,
+                "n": len(pair),
+                "sum_a": pair[a].sum(),
+                "sum_b": pair[b].sum(),
+                "sum_aa": (pair[a] ** 2).sum(),
+                "sum_bb": (pair[b] ** 2).sum(),
+                "sum_ab": (pair[a] * pair[b]).sum(),
+            }
+        )
+
+    return {
+        "hour_weekday": hour_weekday,
+        "location_month": location_month,
+        "fatal_by_narcan": fatal_by_narcan,
+        "moments": pd.DataFrame(moments),
+    }
@@ -0,0 +1,125 @@
+"""Change feed for incremental sync of incidents.
+
+Every insert, update and delete is appended to `IncidentChange` with a
+monotonic sequence number, so consumers pull "changes since N" instead of
+re-reading the table. Compaction drops entries superseded by a later
+change to the same incident; the newest entry per incident (including
+delete tombstones) is always kept, so a consumer resuming from any cursor
+still converges on the current state.
+
+Sequence numbers are assigned when a change is inserted, not when its
+transaction commits, so a lower number can become visible after a higher
+one. The feed therefore only serves changes that have settled: recorded
+at least `CHANGE_FEED_SETTLE_SECONDS` ago, and below the first change that
+hasn't. A consumer's cursor never moves past a change still being
+committed, as long as write transactions finish within that window.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Min, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import Incident, IncidentChange
+
+CHANGE_FEED_MAX_LIMIT = 1000
+DEFAULT_SETTLE_SECONDS = 30
+INCIDENT_FIELDS = [field.attname for field in Incident._meta.concrete_fields]
+
+
+def serialize_incident(values):
+    return {
+        name: value.isoformat() if hasattr(value, "isoformat") else value
+        for name, value in values.items()
+    }
+
+
+def record_change(operation, instance):
+    data = None
+    if operation != IncidentChange.DELETE:
+        data = serialize_incident(
+            {name: getattr(instance, name) for name in INCIDENT_FIELDS}
+        )
+    IncidentChange.objects.create(
+        incident_id=instance.pk, operation=operation, data=data
+    )
+
+
+def record_changes(operation, incident_ids):
+    """Log a change for each incident, for writes that bypass model signals."""
+    incident_ids = list(incident_ids)
+    if operation == IncidentChange.DELETE:
+        entries = [
+            IncidentChange(incident_id=incident_id, operation=operation)
+            for incident_id in incident_ids
+        ]
+    else:
+        entries = [
+            IncidentChange(
+                incident_id=values["id"],
+                operation=operation,
+                data=serialize_incident(values),
+            )
+            for values in Incident.objects.filter(id__in=incident_ids)
+            .order_by("id")
+            .values(*INCIDENT_FIELDS)
+        ]
+    IncidentChange.objects.bulk_create(entries, batch_size=500)
+
+
+def serialize_change(change):
+    return {
+        "seq": change.seq,
+        "incident_id": change.incident_id,
+        "operation": change.operation,
+        "data": change.data,
+        "recorded_at": change.recorded_at.isoformat(),
+    }
+
+
+def get_settle_seconds():
+    return getattr(settings, "CHANGE_FEED_SETTLE_SECONDS", DEFAULT_SETTLE_SECONDS)
+
+
+def get_changes_since(since, limit=CHANGE_FEED_MAX_LIMIT):
+    """Up to `limit` settled changes after sequence number `since`, oldest first."""
+    limit = max(1, min(limit, CHANGE_FEED_MAX_LIMIT))
+    settled_before = timezone.now() - timedelta(seconds=get_settle_seconds())
+    changes = IncidentChange.objects.filter(seq__gt=since)
+    # recorded_at isn't strictly ordered by seq, so stop at the first unsettled change
+    horizon = changes.filter(recorded_at__gt=settled_before).aggregate(
+        horizon=Min("seq")
+    )["horizon"]
+    if horizon is not None:
+        changes = changes.filter(seq__lt=horizon)
+    changes = list(changes.order_by("seq")[: limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    return {
+        "changes": [serialize_change(change) for change in changes],
+        "next_since": changes[-1].seq if changes else since,
+        "has_more": has_more,
+    }
+
+
+def iter_changes_since(since, batch_size=CHANGE_FEED_MAX_LIMIT):
+    while True:
+        batch = get_changes_since(since, batch_size)
+        yield from batch["changes"]
+        since = batch["next_since"]
+        if not batch["has_more"]:
+            return
+
+
+def compact_changes(older_than):
+    latest_for_incident = (
+        IncidentChange.objects.filter(incident_id=OuterRef("incident_id"))
+        .order_by("-seq")
+        .values("seq")[:1]
+    )
+    return (
+        IncidentChange.objects.filter(recorded_at__lt=timezone.now() - older_than)
+        .exclude(seq=Subquery(latest_for_incident))
+        .delete()[0]
+    )
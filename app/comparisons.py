@@ -0,0 +1,109 @@
+"""Year × month comparison of incidents, fatalities and narcan doses.
+
+The matrix is read straight from a region's month catalogue (the monthly
+rollup `MonthIndex` keeps with one grouped aggregate per affected month),
+so building it never touches the incident tables. Each cell carries its
+change against the previous month and against the same month a year
+earlier. The result is cached under the catalogue version, so it is
+recomputed only after one of the region's months changes.
+"""
+
+from datetime import date
+
+from django.core.cache import cache
+
+from .month_index import get_catalogue_version, get_month_catalogue
+
+CACHE_KEY = "comparison_matrix"
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+METRICS = {
+    "incidents": "incident_count",
+    "fatalities": "fatal_count",
+    "narcan": "narcan_total",
+}
+
+
+def _change(current, previous):
+    if previous is None:
+        return {"delta": None, "percent": None}
+    delta = current - previous
+    percent = round(delta / previous * 100, 1) if previous else None
+    return {"delta": delta, "percent": percent}
+
+
+def _previous_month(year, month):
+    return (year, month - 1) if month > 1 else (year - 1, 12)
+
+
+def build_comparison_matrix(catalogue, today=None):
+    """Rows of 12 cells per year, from the first month with data to this month.
+
+    Months inside that range without incidents count as zero; cells outside
+    it are None and are skipped as comparison baselines.
+    """
+    if not catalogue:
+        return []
+    today = today or date.today()
+    first = catalogue[0].month
+    last = max(catalogue[-1].month, date(today.year, today.month, 1))
+    totals = {
+        (entry.month.year, entry.month.month): {
+            metric: getattr(entry, field) for metric, field in METRICS.items()
+        }
+        for entry in catalogue
+    }
+    zero = dict.fromkeys(METRICS, 0)
+
+    def values_for(year, month):
+        if not first <= date(year, month, 1) <= last:
+            return None
+        return totals.get((year, month), zero)
+
+    rows = []
+    for year in range(first.year, last.year + 1):
+        cells = []
+        for month in range(1, 13):
+            values = values_for(year, month)
+            if values is None:
+                cells.append(None)
+                continue
+            previous_month = values_for(*_previous_month(year, month))
+            previous_year = values_for(year - 1, month)
+            cells.append(
+                {
+                    "month": f"{year}-{month:02d}",
+                    **{
+                        metric: {
+                            "value": value,
+                            "mom": _change(
+                                value, previous_month and previous_month[metric]
+                            ),
+                            "yoy": _change(
+                                value, previous_year and previous_year[metric]
+                            ),
+                        }
+                        for metric, value in values.items()
+                    },
+                }
+            )
+        rows.append(
+            {
+                "year": year,
+                "months": cells,
+                "totals": {
+                    metric: sum(cell[metric]["value"] for cell in cells if cell)
+                    for metric in METRICS
+                },
+            }
+        )
+    return rows
+
+
+def get_comparison_matrix(region_id, today=None):
+    today = today or date.today()
+    key = f"{CACHE_KEY}:{region_id}:{get_catalogue_version(region_id)}:{today:%Y-%m}"
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_comparison_matrix(get_month_catalogue(region_id), today)
+        cache.set(key, matrix, CACHE_TIMEOUT)
+    return matrix
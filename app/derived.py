@@ -0,0 +1,44 @@
+"""Refreshing derived data after writes that skip model signals.
+
+`QuerySet.update()` and `bulk_create()` don't send save/delete signals, so
+callers using them pass the affected regions and months here instead.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.functions import TruncMonth
+
+from . import hotspots, jobs, month_index, trends
+
+
+def affected_months(queryset):
+    """(region_id, month) pairs covered by the queryset's incidents."""
+    return list(
+        queryset.annotate(month=TruncMonth("datetime"))
+        .values_list("region_id", "month")
+        .order_by()
+        .distinct()
+    )
+
+
+def refresh_derived_data(region_months=None):
+    """Refresh derived data for (region_id, datetime) pairs, or everything."""
+    if region_months is None:
+        month_index.rebuild_month_index()
+        hotspots.rebuild_hotspots()
+        trends.rebuild_daily_totals()
+        return
+    months_by_region = defaultdict(set)
+    for region_id, moment in region_months:
+        months_by_region[region_id].add(month_index.month_start(moment))
+    for region_id, months in months_by_region.items():
+        month_index.refresh_months(region_id, months)
+        hotspots.refresh_months(region_id, months)
+        trends.refresh_months(region_id, months)
+        for month in months:
+            transaction.on_commit(
+                lambda region_id=region_id, month=month: jobs.enqueue_month_refresh(
+                    region_id, month
+                )
+            )
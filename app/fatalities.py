@@ -0,0 +1,118 @@
+"""Fatal incident listing and derived fatality statistics.
+
+Everything here reads only one region's fatal rows, which the partial
+indexes `incident_fatal_region_idx` and `archived_fatal_region_idx` keep
+ordered by datetime. The listing is keyset-paginated on (datetime, id) so
+deep pages cost the same as the first; once the cursor passes the archive
+boundary each page merges one indexed read per table. The derived values
+are cached per region under its month catalogue version, which changes
+whenever one of its months (and so any of its fatal rows) is refreshed.
+"""
+
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .month_index import get_catalogue_version, get_month_catalogue
+from .storage import get_incident_models
+
+FATAL_PAGE_SIZE = 25
+CACHE_KEY = "fatal_stats"
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def encode_cursor(incident):
+    return f"{incident.datetime.isoformat()}_{incident.id}"
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, incident_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(timestamp), int(incident_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def get_fatal_incidents_page(region_id, cursor=None, page_size=FATAL_PAGE_SIZE):
+    """Return one page of fatal incidents (newest first) and the cursor for the next."""
+    position = decode_cursor(cursor) if cursor else None
+    page = []
+    for model in get_incident_models():
+        queryset = model.objects.filter(
+            region_id=region_id, fatal_incident=True
+        ).order_by("-datetime", "-id")
+        if position is not None:
+            before_datetime, before_id = position
+            queryset = queryset.filter(
+                Q(datetime__lt=before_datetime)
+                | Q(datetime=before_datetime, id__lt=before_id)
+            )
+        page.extend(queryset[: page_size + 1])
+    # archived ids are the original ones, so (datetime, id) stays a total order
+    page.sort(key=lambda incident: (incident.datetime, incident.id), reverse=True)
+    page = page[: page_size + 1]
+    next_cursor = encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+    return page[:page_size], next_cursor
+
+
+def _monthly_fatality_series(region_id):
+    catalogue = get_month_catalogue(region_id)
+    if not catalogue:
+        return []
+    by_month = {entry.month: entry.fatal_count for entry in catalogue}
+    series = []
+    year, month = catalogue[0].month.year, catalogue[0].month.month
+    last = catalogue[-1].month
+    while (year, month) <= (last.year, last.month):
+        current = catalogue[0].month.replace(year=year, month=month)
+        series.append({"month": current, "fatal_count": by_month.get(current, 0)})
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return series
+
+
+def _compute_fatal_stats(region_id):
+    fatal_datetimes = []
+    most_recent = None
+    for model in get_incident_models():
+        fatal = model.objects.filter(region_id=region_id, fatal_incident=True)
+        fatal_datetimes.extend(
+            fatal.order_by("datetime").values_list("datetime", flat=True)
+        )
+        latest = (
+            fatal.order_by("-datetime", "-id")
+            .values("id", "datetime", "location")
+            .first()
+        )
+        if latest is not None and (
+            most_recent is None
+            or (latest["datetime"], latest["id"])
+            > (most_recent["datetime"], most_recent["id"])
+        ):
+            most_recent = latest
+    fatal_datetimes.sort()
+    longest_gap = None
+    for previous, current in zip(fatal_datetimes, fatal_datetimes[1:]):
+        gap = current - previous
+        if longest_gap is None or gap > longest_gap["duration"]:
+            longest_gap = {"duration": gap, "start": previous, "end": current}
+    return {
+        "total": len(fatal_datetimes),
+        "most_recent": most_recent,
+        "longest_gap": longest_gap,
+    }
+
+
+def get_fatal_stats(region_id):
+    cache_key = f"{CACHE_KEY}:{region_id}:{get_catalogue_version(region_id)}"
+    stats = cache.get(cache_key)
+    if stats is None:
+        stats = _compute_fatal_stats(region_id)
+        cache.set(cache_key, stats, CACHE_TIMEOUT)
+    most_recent = stats["most_recent"]
+    # these follow the clock and the month catalogue, so they are derived per read
+    stats["days_since_last_fatality"] = (
+        (datetime.now() - most_recent["datetime"]).days if most_recent else None
+    )
+    stats["monthly_series"] = _monthly_fatality_series(region_id)
+    return stats
@@ -1,7 +1,8 @@
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django import forms
-from .models import Incident
+from django.conf import settings
+from .models import Incident, Region
 
 
 class RegistrationForm(UserCreationForm):
@@ -67,9 +68,16 @@ class RegistrationForm(UserCreationForm):
 
 
 class IncidentForm(forms.ModelForm):
+    region = forms.ModelChoiceField(
+        queryset=Region.objects.all(),
+        to_field_name="slug",
+        initial=lambda: settings.DEFAULT_REGION,
+        empty_label=None,
+    )
+
     class Meta:
         model = Incident
-        exclude = ("user",)
+        exclude = ("user", "idempotency_key")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -0,0 +1,43 @@
+import math
+
+
+def parse_coordinates(value):
+    """Parse a "lat, lon" string into floats, or return None if it isn't valid."""
+    if not value:
+        return None
+    try:
+        lat, lon = map(float, value.split(","))
+    except ValueError:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def format_coordinates(lat, lon):
+    return f"{lat:.6f}, {lon:.6f}"
+
+
+def normalize_coordinates(value):
+    parsed = parse_coordinates(value)
+    return format_coordinates(*parsed) if parsed else None
+
+
+# about 550m north-south and 375m east-west at Spokane's latitude
+GRID_CELL_DEGREES = 0.005
+
+
+def grid_cell(value):
+    """The "row:column" grid cell a "lat, lon" string falls in, or None."""
+    parsed = parse_coordinates(value)
+    if parsed is None:
+        return None
+    lat, lon = parsed
+    return f"{math.floor(lat / GRID_CELL_DEGREES)}:{math.floor(lon / GRID_CELL_DEGREES)}"
+
+
+def grid_cell_center(cell):
+    row, column = map(int, cell.split(":"))
+    return format_coordinates(
+        (row + 0.5) * GRID_CELL_DEGREES, (column + 0.5) * GRID_CELL_DEGREES
+    )
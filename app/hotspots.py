@@ -0,0 +1,142 @@
+"""Recurring locations and areas, ranked for any period.
+
+Every incident counts towards its normalized location key and, when it has
+coordinates, its grid cell, in one `HotspotCount` row per region and month.
+Single incident writes adjust those rows with F() deltas; bulk writes
+recount the affected months. A ranking sums a handful of indexed rows per month rather
+than grouping raw location strings.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q, Sum
+
+from .geo import grid_cell_center
+from .models import HotspotCount
+from .month_index import get_month_catalogue, month_bounds, month_start
+from .regions import get_region_ids
+from .storage import group_incidents, incident_querysets
+
+DEFAULT_LIMIT = 10
+HOTSPOT_FIELDS = (
+    "region_id",
+    "datetime",
+    "location",
+    "location_key",
+    "grid_cell",
+    "number_affected",
+    "fatal_incident",
+)
+KEY_FIELDS = {HotspotCount.LOCATION: "location_key", HotspotCount.CELL: "grid_cell"}
+
+
+def incident_values(instance):
+    return {name: getattr(instance, name) for name in HOTSPOT_FIELDS}
+
+
+def _label(kind, key, location):
+    return grid_cell_center(key) if kind == HotspotCount.CELL else location
+
+
+def record_delta(values, sign):
+    """Add (sign=1) or remove (sign=-1) one incident's counts."""
+    month = month_start(values["datetime"])
+    deltas = {
+        "incident_count": sign,
+        "affected_total": sign * values["number_affected"],
+        "fatal_count": sign if values["fatal_incident"] else 0,
+    }
+    increments = {name: F(name) + delta for name, delta in deltas.items()}
+    for kind, field in KEY_FIELDS.items():
+        key = values[field]
+        if not key:
+            continue
+        rows = HotspotCount.objects.filter(
+            region_id=values["region_id"], kind=kind, key=key, month=month
+        )
+        updated = rows.update(**increments)
+        if sign < 0:
+            rows.filter(incident_count__lte=0).delete()
+        if updated or sign < 0:
+            continue
+        try:
+            with transaction.atomic():
+                HotspotCount.objects.create(
+                    region_id=values["region_id"],
+                    kind=kind,
+                    key=key,
+                    month=month,
+                    label=_label(kind, key, values["location"]),
+                    **deltas,
+                )
+        except IntegrityError:
+            # another writer created the row first
+            rows.update(**increments)
+
+
+def _hotspot_aggregates():
+    return {
+        "label": Min("location"),
+        "incident_count": Count("id"),
+        "affected_total": Sum("number_affected"),
+        "fatal_count": Count("id", filter=Q(fatal_incident=True)),
+    }
+
+
+def refresh_months(region_id, months):
+    for month in {month_start(m) for m in months if m is not None}:
+        start, end = month_bounds(month)
+        entries = []
+        for kind, field in KEY_FIELDS.items():
+            querysets = [
+                queryset.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+                for queryset in incident_querysets(
+                    start, region_id=region_id, datetime__lt=end
+                )
+            ]
+            groups = group_incidents(
+                querysets, "hotspot_key", F(field), **_hotspot_aggregates()
+            )
+            entries.extend(
+                HotspotCount(
+                    region_id=region_id,
+                    kind=kind,
+                    key=key,
+                    month=month,
+                    **{**totals, "label": _label(kind, key, totals["label"])},
+                )
+                for key, totals in groups.items()
+            )
+        with transaction.atomic():
+            HotspotCount.objects.filter(region_id=region_id, month=month).delete()
+            HotspotCount.objects.bulk_create(entries, batch_size=500)
+
+
+def rebuild_hotspots():
+    with transaction.atomic():
+        HotspotCount.objects.all().delete()
+        for region_id in get_region_ids():
+            refresh_months(
+                region_id, [entry.month for entry in get_month_catalogue(region_id)]
+            )
+
+
+def get_top_hotspots(
+    region_id, since=None, until=None, kind=HotspotCount.LOCATION, limit=DEFAULT_LIMIT
+):
+    """A region's most frequent locations (or grid cells) between two datetimes."""
+    rows = HotspotCount.objects.filter(region_id=region_id, kind=kind)
+    if since is not None:
+        rows = rows.filter(month__gte=month_start(since))
+    if until is not None:
+        rows = rows.filter(month__lte=month_start(until))
+    return list(
+        rows.values("key")
+        .annotate(
+            name=Min("label"),
+            incident_count=Sum("incident_count"),
+            affected_total=Sum("affected_total"),
+            fatal_count=Sum("fatal_count"),
+            months=Count("id"),
+        )
+        .order_by("-incident_count", "-affected_total", "key")[:limit]
+    )
@@ -0,0 +1,167 @@
+"""Batched incident ingestion for the JSON API.
+
+A batch is validated item by item against the same fields `IncidentForm`
+uses, then every valid, not-yet-seen item is inserted with one
+`bulk_create` inside a transaction. Items carrying an `idempotency_key`
+that is already stored (in the hot table or the archive) or repeated
+earlier in the batch are reported as duplicates instead of being inserted
+again, so clients can retry safely.
+"""
+
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+
+from .changes import record_changes
+from .derived import refresh_derived_data
+from .forms import IncidentForm
+from .geo import normalize_coordinates
+from .models import ArchivedIncident, Incident, IncidentChange
+from .regions import get_region, get_regions
+
+MAX_BATCH_SIZE = 5000
+IDEMPOTENCY_KEY_MAX_LENGTH = Incident._meta.get_field("idempotency_key").max_length
+SCALAR_TYPES = (str, int, float, bool, type(None))
+# regions are resolved from one lookup per batch rather than a query per item
+INCIDENT_FIELDS = {
+    name: field for name, field in IncidentForm.base_fields.items() if name != "region"
+}
+
+
+def clean_item(item, region_ids):
+    """Return (cleaned_data, errors) for one submitted incident.
+
+    `region_ids` maps region slugs to ids; items without a region go to
+    the default region, stored under the None key.
+    """
+    if not isinstance(item, dict):
+        return None, {"__all__": ["Each incident must be a JSON object"]}
+    errors = {}
+    cleaned = {}
+    unknown = set(item) - set(INCIDENT_FIELDS) - {"idempotency_key", "region"}
+    if unknown:
+        errors["__all__"] = [f"Unknown fields: {', '.join(sorted(unknown))}"]
+    for name, field in INCIDENT_FIELDS.items():
+        value = item.get(name)
+        # form fields expect one submitted value; lists and objects would
+        # raise from deep inside their parsing rather than fail validation
+        if not isinstance(value, SCALAR_TYPES):
+            errors[name] = ["Must be a single value, not a list or object"]
+            continue
+        try:
+            cleaned[name] = field.clean(value)
+        except ValidationError as error:
+            errors[name] = error.messages
+    region = item.get("region")
+    if region is not None and not isinstance(region, str):
+        errors["region"] = ["Must be a region slug"]
+        region_id = None
+    else:
+        region_id = region_ids.get(region)
+        if region_id is None:
+            errors["region"] = [f"Unknown region {region!r}"]
+    key = item.get("idempotency_key")
+    if key is not None and (
+        not isinstance(key, str) or not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH
+    ):
+        errors["idempotency_key"] = [
+            f"Must be a non-empty string of at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+        ]
+    if errors:
+        return None, errors
+    if cleaned.get("coordinates"):
+        cleaned["coordinates"] = (
+            normalize_coordinates(cleaned["coordinates"]) or cleaned["coordinates"]
+        )
+    cleaned["idempotency_key"] = key
+    cleaned["region_id"] = region_id
+    return cleaned, None
+
+
+def _insert(pending):
+    """Insert (index, cleaned) pairs not already stored; returns {index: id}."""
+    keys = [cleaned["idempotency_key"] for _, cleaned in pending]
+    existing = {}
+    for model in (ArchivedIncident, Incident):
+        existing.update(
+            model.objects.filter(idempotency_key__in=keys).values_list(
+                "idempotency_key", "id"
+            )
+        )
+    duplicates = {
+        index: existing[cleaned["idempotency_key"]]
+        for index, cleaned in pending
+        if cleaned["idempotency_key"] in existing
+    }
+    new = [(index, cleaned) for index, cleaned in pending if index not in duplicates]
+    incidents = [Incident(**cleaned) for _, cleaned in new]
+    for incident in incidents:
+        incident.assign_location_keys()
+    incidents = Incident.objects.bulk_create(incidents, batch_size=1000)
+    if incidents and incidents[0].pk is None:
+        # this backend can't return ids from a bulk insert; look them up by key
+        ids = dict(
+            Incident.objects.filter(
+                idempotency_key__in=[cleaned["idempotency_key"] for _, cleaned in new]
+            ).values_list("idempotency_key", "id")
+        )
+        for incident in incidents:
+            incident.pk = ids[incident.idempotency_key]
+    created = {index: incident.pk for (index, _), incident in zip(new, incidents)}
+    return created, duplicates
+
+
+def ingest_incidents(items):
+    results = [None] * len(items)
+    region_ids = {region.slug: region.id for region in get_regions()}
+    default_region = get_region()
+    region_ids[None] = default_region.id if default_region else None
+    pending = []
+    first_index_for_key = {}
+    for index, item in enumerate(items):
+        cleaned, errors = clean_item(item, region_ids)
+        if errors:
+            results[index] = {"index": index, "status": "invalid", "errors": errors}
+            continue
+        key = cleaned["idempotency_key"]
+        if key is None:
+            if not connection.features.can_return_rows_from_bulk_insert:
+                cleaned["idempotency_key"] = key = uuid.uuid4().hex
+        elif key in first_index_for_key:
+            results[index] = {
+                "index": index,
+                "status": "duplicate",
+                "duplicate_of_index": first_index_for_key[key],
+            }
+            continue
+        if key is not None:
+            first_index_for_key[key] = index
+        pending.append((index, cleaned))
+
+    # a concurrent retry of the same batch can win the race on a key; the
+    # second pass then sees its rows and reports them as duplicates
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                created, duplicates = _insert(pending)
+                record_changes(IncidentChange.INSERT, created.values())
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+
+    for index, incident_id in created.items():
+        results[index] = {"index": index, "status": "created", "id": incident_id}
+    for index, incident_id in duplicates.items():
+        results[index] = {"index": index, "status": "duplicate", "id": incident_id}
+
+    if created:
+        cleaned_by_index = dict(pending)
+        refresh_derived_data(
+            [
+                (cleaned_by_index[index]["region_id"], cleaned_by_index[index]["datetime"])
+                for index in created
+            ]
+        )
+    return results
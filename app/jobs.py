@@ -0,0 +1,215 @@
+"""Database-backed queue for work that shouldn't hold up a write request.
+
+Writes call `enqueue()`; `manage.py run_jobs` claims and runs the jobs.
+Pending jobs with the same kind and key are coalesced, so a burst of
+incidents in one month queues a single refresh for it. Failures are
+retried with exponential backoff up to `MAX_ATTEMPTS`.
+
+A worker claims a job with a conditional update from pending to running,
+so two workers never run the same job even where SELECT ... SKIP LOCKED
+is unavailable (SQLite). A job left running longer than `LEASE_SECONDS`
+belonged to a worker that died; it is queued again, or failed once it
+has used up its attempts.
+
+With JOBS_RUN_INLINE enabled, jobs run immediately in the caller, which
+is handy when no worker is running. Without either, the caches the jobs
+warm are simply rebuilt by the next request that needs them. The derived
+tables themselves are refreshed by the write that changed them, never here.
+"""
+
+import logging
+import traceback
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import changes, fatalities, hotspots, month_index
+from .regions import get_region_ids
+from .geo import grid_cell, normalize_coordinates
+from .models import Incident, IncidentChange, Job
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 10
+LEASE_SECONDS = 60 * 15
+
+HANDLERS = {}
+
+
+def job_handler(kind):
+    def register(function):
+        HANDLERS[kind] = function
+        return function
+
+    return register
+
+
+def enqueue(kind, key="", payload=None, delay=0):
+    """Queue a job unless an identical one is already pending."""
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+    payload = payload or {}
+    if getattr(settings, "JOBS_RUN_INLINE", False):
+        HANDLERS[kind](**payload)
+        return None
+    if Job.objects.filter(kind=kind, key=key, status=Job.PENDING).exists():
+        return None
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                kind=kind,
+                key=key,
+                payload=payload,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        # lost the race to another writer queueing the same job
+        return None
+
+
+def claim_next_job():
+    while True:
+        with transaction.atomic():
+            pending = Job.objects.filter(
+                status=Job.PENDING, run_after__lte=timezone.now()
+            ).order_by("run_after", "id")
+            if connection.features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            job = pending.first()
+            if job is None:
+                return None
+            claimed = Job.objects.filter(pk=job.pk, status=Job.PENDING).update(
+                status=Job.RUNNING,
+                attempts=F("attempts") + 1,
+                updated_at=timezone.now(),
+            )
+        if claimed:
+            job.refresh_from_db()
+            return job
+        # another worker claimed it between our read and update
+
+
+def requeue_stale_jobs(lease_seconds=LEASE_SECONDS):
+    """Queue again the jobs whose worker stopped before finishing them."""
+    requeued = 0
+    stale = Job.objects.filter(
+        status=Job.RUNNING,
+        updated_at__lt=timezone.now() - timedelta(seconds=lease_seconds),
+    )
+    for job in stale:
+        # only if the worker hasn't finished it meanwhile
+        expired = Job.objects.filter(
+            pk=job.pk, status=Job.RUNNING, updated_at=job.updated_at
+        )
+        if job.attempts >= MAX_ATTEMPTS:
+            expired.update(
+                status=Job.FAILED,
+                last_error="Lease expired",
+                updated_at=timezone.now(),
+            )
+            continue
+        try:
+            with transaction.atomic():
+                requeued += expired.update(
+                    status=Job.PENDING,
+                    run_after=timezone.now(),
+                    updated_at=timezone.now(),
+                )
+        except IntegrityError:
+            # an identical job is already pending and will do the work
+            expired.delete()
+    return requeued
+
+
+def run_job(job):
+    try:
+        HANDLERS[job.kind](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        logger.exception("Job %s failed (attempt %s)", job, job.attempts)
+        if job.attempts >= MAX_ATTEMPTS or job.kind not in HANDLERS:
+            job.status = Job.FAILED
+        else:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            )
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            # an identical job was queued meanwhile and will do the work
+            job.delete()
+        return False
+    job.status = Job.DONE
+    job.last_error = ""
+    job.save(update_fields=["status", "last_error", "updated_at"])
+    return True
+
+
+def run_pending_jobs(limit=None, lease_seconds=LEASE_SECONDS):
+    requeue_stale_jobs(lease_seconds)
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def purge_finished_jobs(older_than):
+    return Job.objects.filter(
+        status=Job.DONE, updated_at__lt=timezone.now() - older_than
+    ).delete()[0]
+
+
+def enqueue_month_refresh(region_id, moment):
+    month = month_index.month_start(moment)
+    enqueue(
+        "refresh_month",
+        key=f"{region_id}:{month.isoformat()}",
+        payload={"region_id": region_id, "month": month.isoformat()},
+    )
+
+
+@job_handler("refresh_month")
+def refresh_month(month, region_id=None):
+    # views pulls in matplotlib and folium, which only the worker needs here
+    from .views import warm_dashboard_graphics
+
+    month = date.fromisoformat(month)
+    # the write already refreshed the month's derived rows; this only warms
+    # the caches built from them. Jobs queued before regions existed carry
+    # no region, so they warm every region's
+    for region_id in get_region_ids() if region_id is None else [region_id]:
+        fatalities.get_fatal_stats(region_id)
+        if month_index.get_month_entry(region_id, month.year, month.month) is not None:
+            warm_dashboard_graphics(region_id, month.strftime("%Y-%m"))
+        warm_dashboard_graphics(region_id, "all_time")
+
+
+@job_handler("parse_coordinates")
+def parse_coordinates(incident_id):
+    incident = (
+        Incident.objects.filter(pk=incident_id)
+        .values("coordinates", "datetime", "region_id")
+        .first()
+    )
+    if incident is None or incident["coordinates"] is None:
+        return
+    normalized = normalize_coordinates(incident["coordinates"])
+    # unparseable input stays as entered rather than being blanked
+    if normalized is not None and normalized != incident["coordinates"]:
+        Incident.objects.filter(pk=incident_id).update(
+            coordinates=normalized, grid_cell=grid_cell(normalized)
+        )
+        changes.record_changes(IncidentChange.UPDATE, [incident_id])
+        # update() sends no signals, and hotspots count by grid cell
+        hotspots.refresh_months(incident["region_id"], [incident["datetime"]])
+        enqueue_month_refresh(incident["region_id"], incident["datetime"])
@@ -0,0 +1,71 @@
+"""Canonical keys for the free-text incident location.
+
+"1st Ave & Division St.", "Division Street and First Avenue" and
+"division st / 1st ave" all normalize to "1st ave & division st": case
+and punctuation are dropped, street types, directions and spelled-out
+ordinals are abbreviated, and the streets of an intersection are sorted.
+The same few spellings repeat endlessly, so the normalizer is memoized.
+"""
+
+import re
+from functools import lru_cache
+
+STREET_TYPES = {
+    "street": "st",
+    "str": "st",
+    "avenue": "ave",
+    "av": "ave",
+    "boulevard": "blvd",
+    "road": "rd",
+    "drive": "dr",
+    "lane": "ln",
+    "place": "pl",
+    "court": "ct",
+    "parkway": "pkwy",
+    "highway": "hwy",
+    "circle": "cir",
+    "terrace": "ter",
+}
+DIRECTIONS = {
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "northeast": "ne",
+    "northwest": "nw",
+    "southeast": "se",
+    "southwest": "sw",
+}
+ORDINALS = {
+    "first": "1st",
+    "second": "2nd",
+    "third": "3rd",
+    "fourth": "4th",
+    "fifth": "5th",
+    "sixth": "6th",
+    "seventh": "7th",
+    "eighth": "8th",
+    "ninth": "9th",
+    "tenth": "10th",
+}
+ABBREVIATIONS = {**STREET_TYPES, **DIRECTIONS, **ORDINALS}
+
+INTERSECTION_PATTERN = re.compile(r"\s*(?:&|@|/|\+|\band\b|\bat\b)\s*")
+BLOCK_PATTERN = re.compile(r"^\d+\s+block(?:\s+of)?\s+")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s&@/+]")
+LOCATION_KEY_MAX_LENGTH = 100
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(location):
+    """Return the canonical key for a location, or "" if there's nothing to key."""
+    if not location:
+        return ""
+    text = PUNCTUATION_PATTERN.sub(" ", location.lower())
+    streets = set()
+    for part in INTERSECTION_PATTERN.split(text):
+        part = BLOCK_PATTERN.sub("", part.strip())
+        words = [ABBREVIATIONS.get(word, word) for word in part.split()]
+        if words:
+            streets.add(" ".join(words))
+    return " & ".join(sorted(streets))[:LOCATION_KEY_MAX_LENGTH]
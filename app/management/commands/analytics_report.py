@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.analytics import build_reports, get_analytics_dir, pd
+
+
+class Command(BaseCommand):
+    help = (
+        "Build Parquet correlation and cross-tab reports from incidents, "
+        "reprocessing only months that changed since the last run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output-dir", default=None)
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--full", action="store_true", help="Reprocess every month"
+        )
+
+    def handle(self, *args, **options):
+        if pd is None:
+            raise CommandError("analytics_report needs pandas and pyarrow installed")
+        output_dir = options["output_dir"] or get_analytics_dir()
+        result = build_reports(
+            output_dir,
+            workers=options["workers"],
+            full=options["full"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {len(result['processed_months'])} of "
+                f"{result['total_months']} months into {output_dir}"
+            )
+        )
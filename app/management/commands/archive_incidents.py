@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.storage import (
+    MIN_ARCHIVE_AFTER_MONTHS,
+    archive_incidents,
+    get_archive_after_months,
+    get_archive_cutoff,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move incidents from months older than the archive horizon into the "
+        "archive table. Dashboards keep reading them transparently."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-months",
+            type=int,
+            default=None,
+            help="Default: INCIDENT_ARCHIVE_AFTER_MONTHS "
+            f"(currently {get_archive_after_months()})",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        months = options["older_than_months"]
+        if months is not None and months < MIN_ARCHIVE_AFTER_MONTHS:
+            raise CommandError(
+                f"--older-than-months must be at least {MIN_ARCHIVE_AFTER_MONTHS}"
+            )
+        cutoff = get_archive_cutoff(months)
+        moved = archive_incidents(cutoff, options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {moved} incidents from before {cutoff:%B %Y}"
+            )
+        )
@@ -0,0 +1,57 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from app.views import get_graphic, get_graphic2, get_graphic3
+
+
+def sample_series(days):
+    today = date.today()
+    incidents_per_day = [
+        {"date_only": today - timedelta(days=offset), "daily_total": random.randint(0, 8)}
+        for offset in range(days)
+    ]
+    incidents_by_weekday = {
+        day: [random.randint(20, 200), 0]
+        for day in (
+            "Monday",
+            "Tuesday",
+            "Wednesday",
+            "Thursday",
+            "Friday",
+            "Saturday",
+            "Sunday",
+        )
+    }
+    incidents_by_hour = {f"{hour}h": random.randint(0, 40) for hour in range(24)}
+    return incidents_per_day, incidents_by_weekday, incidents_by_hour
+
+
+class Command(BaseCommand):
+    help = "Time the SVG chart renderer against matplotlib for the three dashboard charts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        per_day, by_weekday, by_hour = sample_series(options["days"])
+        charts = {
+            "per day": lambda renderer: get_graphic("all_time", per_day, renderer),
+            "per weekday": lambda renderer: get_graphic2("all_time", by_weekday, renderer),
+            "per hour": lambda renderer: get_graphic3("all_time", by_hour, renderer),
+        }
+        for name, render in charts.items():
+            for renderer in ("png", "svg"):
+                render(renderer)  # warm up
+                started = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    output = render(renderer)
+                elapsed = (time.perf_counter() - started) / options["repeat"]
+                self.stdout.write(
+                    f"{name:<12} {renderer}: {elapsed * 1000:8.2f} ms/render  "
+                    f"{len(output) / 1024:7.1f} KB embedded"
+                )
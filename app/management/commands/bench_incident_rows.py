@@ -0,0 +1,48 @@
+import gc
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import Incident
+from app.rows import fetch_incident_rows
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = load()
+    elapsed = time.perf_counter() - started
+    allocated, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(rows), allocated, elapsed
+
+
+class Command(BaseCommand):
+    help = "Compare memory per row and load time of Incident instances vs IncidentRow records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        queryset = Incident.objects.order_by("datetime")
+        if options["limit"]:
+            queryset = queryset[: options["limit"]]
+        if not queryset.exists():
+            raise CommandError("No incidents to benchmark against")
+
+        loaders = {
+            "model instances": lambda: list(queryset.all()),
+            "IncidentRow (values_list)": lambda: fetch_incident_rows(queryset.all()),
+        }
+        for name, load in loaders.items():
+            runs = [measure(load) for _ in range(options["repeat"])]
+            count, allocated, _ = runs[-1]
+            best = min(elapsed for _, _, elapsed in runs)
+            self.stdout.write(
+                f"{name:<28} {count} rows  "
+                f"{allocated / count:8.0f} bytes/row  "
+                f"{best * 1000:8.2f} ms  ({best / count * 1e6:.2f} us/row)"
+            )
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from app.changes import compact_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Drop change log entries older than the horizon that a later change to "
+        "the same incident supersedes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=30)
+
+    def handle(self, *args, **options):
+        removed = compact_changes(timedelta(days=options["older_than_days"]))
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} superseded changes"))
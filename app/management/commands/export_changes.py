@@ -0,0 +1,34 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from app.changes import CHANGE_FEED_MAX_LIMIT, iter_changes_since
+
+
+class Command(BaseCommand):
+    help = "Stream incident changes after a sequence number as JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=CHANGE_FEED_MAX_LIMIT)
+        parser.add_argument("--output", default="-", help="File path, or - for stdout")
+
+    def handle(self, *args, **options):
+        output = (
+            sys.stdout
+            if options["output"] == "-"
+            else open(options["output"], "w", encoding="utf-8")
+        )
+        last_seq = options["since"]
+        count = 0
+        try:
+            for change in iter_changes_since(options["since"], options["batch_size"]):
+                output.write(json.dumps(change) + "\n")
+                last_seq = change["seq"]
+                count += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        # stderr, so stdout stays a clean JSON lines stream
+        self.stderr.write(f"Exported {count} changes; resume with --since {last_seq}")
@@ -0,0 +1,307 @@
+import contextlib
+import os
+import random
+import re
+import resource
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer,
+    WSGIRequestHandler,
+    get_internal_wsgi_application,
+)
+from django.db import connection
+from django.test import Client
+
+from app.derived import refresh_derived_data
+from app.models import Incident
+from app.regions import get_region
+
+LOCATIONS = [
+    "1st Ave & Division St",
+    "Sprague Ave & Browne St",
+    "Riverfront Park",
+    "Main Ave & Washington St",
+    "Trent Ave & Hamilton St",
+    "Francis Ave & Nevada St",
+    "3rd Ave & Maple St",
+    "Mission Ave & Perry St",
+]
+SEARCH_TERMS = ["Division", "Sprague", "Park", "Main", "Ave"]
+DEFAULT_MIX = "home=6,all_time=1,past_month=2,search=2,add_incident=1"
+CSRF_TOKEN_PATTERN = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # add_incident redirects to home; only the write itself should be timed
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    unknown = set(mix) - {"home", "all_time", "past_month", "search", "add_incident"}
+    if unknown:
+        raise CommandError(f"Unknown request kinds in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def current_rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # peak rather than current RSS, but available on every POSIX platform
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def seed_incidents(count, months):
+    now = datetime.now()
+    span_seconds = int(months * 30.5 * 24 * 3600)
+    region = get_region()
+    incidents = [
+        Incident(
+            region=region,
+            datetime=now - timedelta(seconds=random.randint(0, span_seconds)),
+            location=random.choice(LOCATIONS),
+            number_affected=random.choice((1, 1, 1, 2, 3)),
+            narcan_doses_administered=random.choice((None, 0, 1, 2, 3)),
+            report_text="Seeded load test incident",
+            fatal_incident=random.random() < 0.08,
+            coordinates=(
+                f"{47.62 + random.random() * 0.08:.5f}, "
+                f"{-117.45 + random.random() * 0.1:.5f}"
+            ),
+        )
+        for _ in range(count)
+    ]
+    for incident in incidents:
+        incident.assign_location_keys()
+    Incident.objects.bulk_create(incidents, batch_size=1000)
+    refresh_derived_data()
+
+
+class LoadClient:
+    def __init__(self, base_url, cookies, months):
+        self.base_url = base_url
+        self.months = months
+        self.cookies = dict(cookies)
+        self.opener = urllib.request.build_opener(NoRedirect())
+        self.csrf_token = None
+
+    def open(self, path, data=None):
+        request = urllib.request.Request(self.base_url + path, data=data)
+        request.add_header(
+            "Cookie", "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        )
+        try:
+            response = self.opener.open(request, timeout=60)
+        except urllib.error.HTTPError as error:
+            error.read()
+            return error.code, ""
+        with response:
+            for header in response.headers.get_all("Set-Cookie") or []:
+                name, _, value = header.split(";", 1)[0].partition("=")
+                self.cookies[name.strip()] = value
+            return response.status, response.read().decode()
+
+    def fetch_csrf_token(self):
+        _status, body = self.open("/add_incident/")
+        match = CSRF_TOKEN_PATTERN.search(body)
+        self.csrf_token = match.group(1) if match else ""
+
+    def request(self, kind):
+        if kind == "home":
+            path = "/"
+        elif kind == "all_time":
+            path = "/?time_period=all_time"
+        elif kind == "past_month":
+            path = f"/?time_period={random.choice(self.months)}"
+        elif kind == "search":
+            path = "/?" + urllib.parse.urlencode({"query": random.choice(SEARCH_TERMS)})
+        if kind != "add_incident":
+            return self.open(path)[0]
+        if self.csrf_token is None:
+            self.fetch_csrf_token()
+        form = urllib.parse.urlencode(
+            {
+                "csrfmiddlewaretoken": self.csrf_token,
+                "region": get_region().slug,
+                "datetime": datetime.now().strftime("%Y-%m-%dT%H:%M"),
+                "location": random.choice(LOCATIONS),
+                "number_affected": 1,
+                "report_text": "Load test incident",
+            }
+        ).encode()
+        return self.open("/add_incident/", data=form)[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot the project in-process against a seeded throwaway database and "
+        "measure dashboard throughput, latency, errors and RSS under concurrent load."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--incidents", type=int, default=5000)
+        parser.add_argument("--months", type=int, default=24)
+        parser.add_argument("--clients", type=int, default=10)
+        parser.add_argument("--duration", type=float, default=30, help="Seconds")
+        parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Default: {DEFAULT_MIX}")
+        parser.add_argument("--sample-interval", type=float, default=1.0)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options["mix"])
+        random.seed(options["seed"])
+
+        test_settings = settings.DATABASES["default"].setdefault("TEST", {})
+        temporary_file = None
+        if connection.vendor == "sqlite" and not test_settings.get("NAME"):
+            # threads need a real file; an in-memory database serializes on its lock
+            temporary_file = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False)
+            test_settings["NAME"] = temporary_file.name
+        original_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        settings.DEBUG = False
+        settings.ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+
+        server = None
+        try:
+            self.stdout.write(f"Seeding {options['incidents']} incidents...")
+            seed_incidents(options["incidents"], options["months"])
+            user = User.objects.create_user("loadtest")
+            cookies = self.login_cookies(user)
+            months = [
+                d.strftime("%Y-%m") for d in Incident.objects.dates("datetime", "month")
+            ]
+
+            server = ThreadedWSGIServer(("127.0.0.1", 0), QuietRequestHandler)
+            server.set_app(get_internal_wsgi_application())
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"http://127.0.0.1:{server.server_port}"
+            self.stdout.write(
+                f"Serving on {base_url}; {options['clients']} clients for "
+                f"{options['duration']:.0f}s, mix {mix}"
+            )
+            # keep the views' debug prints out of the report
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                results, rss_samples, elapsed = self.run_load(
+                    base_url, cookies, months, mix, options
+                )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+            connection.creation.destroy_test_db(original_name, verbosity=0)
+            if temporary_file is not None and os.path.exists(temporary_file.name):
+                os.unlink(temporary_file.name)
+
+        self.report(results, rss_samples, elapsed)
+
+    def login_cookies(self, user):
+        client = Client()
+        client.force_login(user)
+        return {
+            settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value
+        }
+
+    def run_load(self, base_url, cookies, months, mix, options):
+        kinds = list(mix)
+        weights = [mix[kind] for kind in kinds]
+        results = defaultdict(list)  # kind -> [(latency_seconds, ok)]
+        results_lock = threading.Lock()
+        stop = threading.Event()
+        started = time.perf_counter()
+        rss_samples = []
+
+        def sample_rss():
+            while not stop.is_set():
+                rss_samples.append((time.perf_counter() - started, current_rss_bytes()))
+                stop.wait(options["sample_interval"])
+
+        def drive(client_number):
+            rng = random.Random(options["seed"] + client_number)
+            client = LoadClient(base_url, cookies, months)
+            while not stop.is_set():
+                kind = rng.choices(kinds, weights)[0]
+                request_started = time.perf_counter()
+                try:
+                    status = client.request(kind)
+                    # an invalid form re-renders with a 200; only the redirect
+                    # means the incident was saved
+                    ok = status == 302 if kind == "add_incident" else status < 400
+                except OSError:
+                    ok = False
+                latency = time.perf_counter() - request_started
+                with results_lock:
+                    results[kind].append((latency, ok))
+
+        threads = [threading.Thread(target=sample_rss, daemon=True)]
+        threads += [
+            threading.Thread(target=drive, args=(number,), daemon=True)
+            for number in range(options["clients"])
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["duration"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return results, rss_samples, time.perf_counter() - started
+
+    def report(self, results, rss_samples, elapsed):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'request':<14}{'count':>8}{'req/s':>9}{'p50 ms':>9}"
+            f"{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}"
+        )
+        everything = []
+        for kind, samples in sorted(results.items()) + [("TOTAL", None)]:
+            if samples is None:
+                samples = everything
+            else:
+                everything.extend(samples)
+            latencies = sorted(latency for latency, _ in samples)
+            errors = sum(1 for _, ok in samples if not ok)
+            self.stdout.write(
+                f"{kind:<14}{len(samples):>8}{len(samples) / elapsed:>9.1f}"
+                f"{percentile(latencies, 0.50) * 1000:>9.1f}"
+                f"{percentile(latencies, 0.95) * 1000:>9.1f}"
+                f"{percentile(latencies, 0.99) * 1000:>9.1f}"
+                f"{(errors / len(samples) * 100 if samples else 0):>8.1f}%"
+            )
+
+        # server and client threads share this process, so RSS covers both
+        self.stdout.write("")
+        self.stdout.write("RSS over time (server and load clients):")
+        for offset, rss in rss_samples:
+            self.stdout.write(f"  {offset:6.1f}s  {rss / 2**20:8.1f} MiB")
+        if rss_samples:
+            peak = max(rss for _, rss in rss_samples)
+            self.stdout.write(f"  peak     {peak / 2**20:8.1f} MiB")
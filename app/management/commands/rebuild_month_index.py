@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.month_index import rebuild_month_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the month catalogue from the incidents table (e.g. after a bulk load)."
+
+    def handle(self, *args, **options):
+        months = rebuild_month_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {months} months"))
@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from app.jobs import LEASE_SECONDS, purge_finished_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued post-write jobs (aggregate refreshes, cache warming, coordinate parsing)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the queue is empty"
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=2.0, help="Seconds to wait when idle"
+        )
+        parser.add_argument(
+            "--lease",
+            type=float,
+            default=LEASE_SECONDS / 60,
+            help="Minutes after which a running job is assumed lost and queued again",
+        )
+        parser.add_argument(
+            "--purge-after",
+            type=float,
+            default=24.0,
+            help="Delete finished jobs older than this many hours",
+        )
+
+    def handle(self, *args, **options):
+        purge_age = timedelta(hours=options["purge_after"])
+        lease_seconds = options["lease"] * 60
+        try:
+            while True:
+                processed = run_pending_jobs(lease_seconds=lease_seconds)
+                if processed:
+                    self.stdout.write(f"Ran {processed} jobs")
+                purge_finished_jobs(purge_age)
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping")
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:34
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_month_index(apps, schema_editor):
+    Incident = apps.get_model('app', 'Incident')
+    MonthIndex = apps.get_model('app', 'MonthIndex')
+    rows = (
+        Incident.objects.annotate(month=TruncMonth('datetime'))
+        .values('month')
+        .annotate(
+            incident_count=Count('id'),
+            affected_total=Sum('number_affected'),
+            fatal_count=Count('id', filter=Q(fatal_incident=True)),
+            first_datetime=Min('datetime'),
+            last_datetime=Max('datetime'),
+        )
+        .order_by('month')
+    )
+    MonthIndex.objects.bulk_create(
+        MonthIndex(
+            **{
+                **row,
+                'month': datetime.date(row['month'].year, row['month'].month, 1),
+            }
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_alter_incident_datetime'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+                ('incident_count', models.IntegerField(default=0)),
+                ('affected_total', models.IntegerField(default=0)),
+                ('fatal_count', models.IntegerField(default=0)),
+                ('first_datetime', models.DateTimeField()),
+                ('last_datetime', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('month',),
+            },
+        ),
+        migrations.RunPython(backfill_month_index, migrations.RunPython.noop),
+    ]
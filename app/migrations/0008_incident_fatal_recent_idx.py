@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_monthindex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(condition=models.Q(('fatal_incident', True)), fields=['-datetime', '-id'], name='incident_fatal_recent_idx'),
+        ),
+    ]
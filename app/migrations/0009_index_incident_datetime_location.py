@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_incident_fatal_recent_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='incident',
+            name='datetime',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='location',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IncidentChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('incident_id', models.BigIntegerField(db_index=True)),
+                ('operation', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update'), ('delete', 'Delete')], max_length=6)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('recorded_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
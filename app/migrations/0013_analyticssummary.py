@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_incident_idempotency_key_apitoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=100, unique=True)),
+                ('value', models.FloatField(blank=True, null=True)),
+                ('detail', models.JSONField(blank=True, default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'analytics summaries',
+            },
+        ),
+    ]
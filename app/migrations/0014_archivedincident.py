@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_analyticssummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIncident',
+            fields=[
+                ('datetime', models.DateTimeField(db_index=True)),
+                ('location', models.CharField(db_index=True, max_length=100)),
+                ('number_affected', models.IntegerField()),
+                ('narcan_doses_administered', models.IntegerField(blank=True, null=True)),
+                ('report_text', models.TextField(max_length=500)),
+                ('fatal_incident', models.BooleanField()),
+                ('coordinates', models.CharField(blank=True, help_text='Latitude, Longitude (e.g. "47.6567, -117.4234")', max_length=50, null=True)),
+                ('idempotency_key', models.CharField(blank=True, max_length=64, null=True, unique=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('fatal_incident', True)), fields=['-datetime', '-id'], name='archived_fatal_recent_idx')],
+            },
+        ),
+    ]
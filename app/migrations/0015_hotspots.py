@@ -0,0 +1,177 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:53
+
+import datetime
+import math
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of app.locations and app.geo as of this migration, so later
+# changes to the normalizer or the grid size don't change what it produces.
+
+ABBREVIATIONS = {
+    'street': 'st',
+    'str': 'st',
+    'avenue': 'ave',
+    'av': 'ave',
+    'boulevard': 'blvd',
+    'road': 'rd',
+    'drive': 'dr',
+    'lane': 'ln',
+    'place': 'pl',
+    'court': 'ct',
+    'parkway': 'pkwy',
+    'highway': 'hwy',
+    'circle': 'cir',
+    'terrace': 'ter',
+    'north': 'n',
+    'south': 's',
+    'east': 'e',
+    'west': 'w',
+    'northeast': 'ne',
+    'northwest': 'nw',
+    'southeast': 'se',
+    'southwest': 'sw',
+    'first': '1st',
+    'second': '2nd',
+    'third': '3rd',
+    'fourth': '4th',
+    'fifth': '5th',
+    'sixth': '6th',
+    'seventh': '7th',
+    'eighth': '8th',
+    'ninth': '9th',
+    'tenth': '10th',
+}
+INTERSECTION_PATTERN = re.compile(r'\s*(?:&|@|/|\+|\band\b|\bat\b)\s*')
+BLOCK_PATTERN = re.compile(r'^\d+\s+block(?:\s+of)?\s+')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s&@/+]')
+LOCATION_KEY_MAX_LENGTH = 100
+GRID_CELL_DEGREES = 0.005
+
+
+def normalize_location(location):
+    if not location:
+        return ''
+    text = PUNCTUATION_PATTERN.sub(' ', location.lower())
+    streets = set()
+    for part in INTERSECTION_PATTERN.split(text):
+        part = BLOCK_PATTERN.sub('', part.strip())
+        words = [ABBREVIATIONS.get(word, word) for word in part.split()]
+        if words:
+            streets.add(' '.join(words))
+    return ' & '.join(sorted(streets))[:LOCATION_KEY_MAX_LENGTH]
+
+
+def parse_coordinates(value):
+    if not value:
+        return None
+    try:
+        lat, lon = map(float, value.split(','))
+    except ValueError:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+def grid_cell(value):
+    parsed = parse_coordinates(value)
+    if parsed is None:
+        return None
+    lat, lon = parsed
+    return f'{math.floor(lat / GRID_CELL_DEGREES)}:{math.floor(lon / GRID_CELL_DEGREES)}'
+
+
+def grid_cell_center(cell):
+    row, column = map(int, cell.split(':'))
+    return f'{(row + 0.5) * GRID_CELL_DEGREES:.6f}, {(column + 0.5) * GRID_CELL_DEGREES:.6f}'
+
+
+def backfill_hotspots(apps, schema_editor):
+    HotspotCount = apps.get_model('app', 'HotspotCount')
+    totals = {}
+    for model_name in ('Incident', 'ArchivedIncident'):
+        model = apps.get_model('app', model_name)
+        changed = []
+        for incident in model.objects.iterator(chunk_size=2000):
+            incident.location_key = normalize_location(incident.location)
+            incident.grid_cell = grid_cell(incident.coordinates)
+            changed.append(incident)
+            month = datetime.date(incident.datetime.year, incident.datetime.month, 1)
+            for kind, key, label in (
+                ('location', incident.location_key, incident.location),
+                ('cell', incident.grid_cell, None),
+            ):
+                if not key:
+                    continue
+                entry = totals.setdefault(
+                    (kind, key, month),
+                    {
+                        'label': label or grid_cell_center(key),
+                        'incident_count': 0,
+                        'affected_total': 0,
+                        'fatal_count': 0,
+                    },
+                )
+                if label:
+                    entry['label'] = min(entry['label'], label)
+                entry['incident_count'] += 1
+                entry['affected_total'] += incident.number_affected
+                entry['fatal_count'] += incident.fatal_incident
+        model.objects.bulk_update(changed, ['location_key', 'grid_cell'], batch_size=500)
+    HotspotCount.objects.bulk_create(
+        (
+            HotspotCount(kind=kind, key=key, month=month, **entry)
+            for (kind, key, month), entry in totals.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0014_archivedincident'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedincident',
+            name='grid_cell',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedincident',
+            name='location_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='incident',
+            name='grid_cell',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='incident',
+            name='location_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.CreateModel(
+            name='HotspotCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('location', 'Location'), ('cell', 'Grid cell')], max_length=10)),
+                ('key', models.CharField(max_length=100)),
+                ('month', models.DateField()),
+                ('label', models.CharField(max_length=100)),
+                ('incident_count', models.IntegerField(default=0)),
+                ('affected_total', models.IntegerField(default=0)),
+                ('fatal_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'month'], name='app_hotspot_kind_599f1f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'key', 'month'), name='unique_hotspot_month')],
+            },
+        ),
+        migrations.RunPython(backfill_hotspots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_hotspots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Region',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('center_latitude', models.FloatField()),
+                ('center_longitude', models.FloatField()),
+                ('zoom', models.PositiveSmallIntegerField(default=12)),
+                ('south', models.FloatField(blank=True, null=True)),
+                ('west', models.FloatField(blank=True, null=True)),
+                ('north', models.FloatField(blank=True, null=True)),
+                ('east', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AddField(
+            model_name='incident',
+            name='region',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='app.region'),
+        ),
+        migrations.AddField(
+            model_name='archivedincident',
+            name='region',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='app.region'),
+        ),
+        migrations.AddField(
+            model_name='monthindex',
+            name='region',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='app.region'),
+        ),
+        migrations.AddField(
+            model_name='hotspotcount',
+            name='region',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='app.region'),
+        ),
+    ]
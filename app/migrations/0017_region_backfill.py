@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:10
+
+from django.conf import settings
+from django.db import migrations
+
+
+def create_default_region(apps, schema_editor):
+    # every incident recorded so far is from Spokane, so it becomes the default region
+    Region = apps.get_model('app', 'Region')
+    region, _ = Region.objects.get_or_create(
+        slug=settings.DEFAULT_REGION,
+        defaults={
+            'name': 'Spokane County',
+            'center_latitude': 47.655329080504096,
+            'center_longitude': -117.39914631901254,
+            'zoom': 12,
+        },
+    )
+    for model_name in ('Incident', 'ArchivedIncident', 'MonthIndex', 'HotspotCount'):
+        apps.get_model('app', model_name).objects.filter(region__isnull=True).update(
+            region=region
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0016_regions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_region, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:10
+
+import app.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0017_region_backfill'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='incident',
+            name='region',
+            field=models.ForeignKey(default=app.models.get_default_region_id, on_delete=django.db.models.deletion.PROTECT, to='app.region'),
+        ),
+        migrations.AlterField(
+            model_name='archivedincident',
+            name='region',
+            field=models.ForeignKey(default=app.models.get_default_region_id, on_delete=django.db.models.deletion.PROTECT, to='app.region'),
+        ),
+        migrations.AlterField(
+            model_name='monthindex',
+            name='region',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.region'),
+        ),
+        migrations.AlterField(
+            model_name='hotspotcount',
+            name='region',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.region'),
+        ),
+        migrations.RemoveConstraint(
+            model_name='hotspotcount',
+            name='unique_hotspot_month',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedincident',
+            name='archived_fatal_recent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='hotspotcount',
+            name='app_hotspot_kind_599f1f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='incident',
+            name='incident_fatal_recent_idx',
+        ),
+        migrations.AlterField(
+            model_name='monthindex',
+            name='month',
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name='archivedincident',
+            index=models.Index(fields=['region', 'datetime'], name='archived_region_datetime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedincident',
+            index=models.Index(condition=models.Q(('fatal_incident', True)), fields=['region', '-datetime', '-id'], name='archived_fatal_region_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotspotcount',
+            index=models.Index(fields=['region', 'kind', 'month'], name='app_hotspot_region__6fd4d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['region', 'datetime'], name='incident_region_datetime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(condition=models.Q(('fatal_incident', True)), fields=['region', '-datetime', '-id'], name='incident_fatal_region_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='hotspotcount',
+            constraint=models.UniqueConstraint(fields=('region', 'kind', 'key', 'month'), name='unique_hotspot_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthindex',
+            constraint=models.UniqueConstraint(fields=('region', 'month'), name='unique_region_month'),
+        ),
+    ]
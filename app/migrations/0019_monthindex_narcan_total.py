@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:00
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_narcan_totals(apps, schema_editor):
+    MonthIndex = apps.get_model('app', 'MonthIndex')
+    totals = {}
+    for model_name in ('Incident', 'ArchivedIncident'):
+        rows = (
+            apps.get_model('app', model_name)
+            .objects.annotate(month=TruncMonth('datetime'))
+            .values('region_id', 'month')
+            .annotate(narcan_total=Sum('narcan_doses_administered', default=0))
+            .order_by()
+        )
+        for row in rows:
+            key = (row['region_id'], datetime.date(row['month'].year, row['month'].month, 1))
+            totals[key] = totals.get(key, 0) + row['narcan_total']
+    entries = list(MonthIndex.objects.all())
+    for entry in entries:
+        entry.narcan_total = totals.get((entry.region_id, entry.month), 0)
+    MonthIndex.objects.bulk_update(entries, ['narcan_total'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0018_region_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthindex',
+            name='narcan_total',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_narcan_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_totals(apps, schema_editor):
+    DailyTotal = apps.get_model('app', 'DailyTotal')
+    totals = {}
+    for model_name in ('Incident', 'ArchivedIncident'):
+        rows = (
+            apps.get_model('app', model_name)
+            .objects.annotate(day=TruncDate('datetime'))
+            .values('region_id', 'day')
+            .annotate(incident_count=Count('id'), affected_total=Sum('number_affected'))
+            .order_by()
+        )
+        for row in rows:
+            entry = totals.setdefault(
+                (row['region_id'], row['day']), {'incident_count': 0, 'affected_total': 0}
+            )
+            entry['incident_count'] += row['incident_count']
+            entry['affected_total'] += row['affected_total']
+    DailyTotal.objects.bulk_create(
+        (
+            DailyTotal(region_id=region_id, day=day, **entry)
+            for (region_id, day), entry in totals.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0019_monthindex_narcan_total'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('incident_count', models.IntegerField(default=0)),
+                ('affected_total', models.IntegerField(default=0)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.region')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('region', 'day'), name='unique_region_day')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+from django.db import migrations
+
+# the admin searches with location__istartswith, which PostgreSQL runs as
+# UPPER(location::text) LIKE UPPER(%s); only an index on that expression with
+# text_pattern_ops can serve the prefix match under a non-C collation, and
+# other backends can't declare the operator class, so it is created here
+# rather than in the models' Meta
+INDEXES = (
+    ('app_incident', 'incident_location_upper_idx'),
+    ('app_archivedincident', 'archived_location_upper_idx'),
+)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, name in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} '
+            f'ON {table} (UPPER("location"::text) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, name in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0020_dailytotal'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
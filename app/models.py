@@ -1,9 +1,58 @@
+import secrets
+
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .geo import grid_cell
+from .locations import normalize_location
+
+
+class Region(models.Model):
+    """A jurisdiction with its own dashboard, map defaults and derived data."""
+
+    slug = models.SlugField(unique=True)
+    name = models.CharField(max_length=100)
+    center_latitude = models.FloatField()
+    center_longitude = models.FloatField()
+    zoom = models.PositiveSmallIntegerField(default=12)
+    # when set, maps are fitted to these bounds instead of centered at zoom
+    south = models.FloatField(null=True, blank=True)
+    west = models.FloatField(null=True, blank=True)
+    north = models.FloatField(null=True, blank=True)
+    east = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def bounds(self):
+        if None in (self.south, self.west, self.north, self.east):
+            return None
+        return [[self.south, self.west], [self.north, self.east]]
 
 
-class Incident(models.Model):
-    datetime = models.DateTimeField()
-    location = models.CharField(max_length=100)
+def get_default_region_id():
+    # read from the cached region list rather than queried per instance;
+    # imported here because regions imports this module
+    from .regions import get_default_region
+
+    region = get_default_region()
+    return region.id if region is not None else None
+
+
+class IncidentRecord(models.Model):
+    """Fields shared by the hot `Incident` table and its archive."""
+
+    region = models.ForeignKey(
+        Region, on_delete=models.PROTECT, default=get_default_region_id
+    )
+    datetime = models.DateTimeField(db_index=True)
+    location = models.CharField(max_length=100, db_index=True)
     number_affected = models.IntegerField()
     narcan_doses_administered = models.IntegerField(null=True, blank=True)
     report_text = models.TextField(max_length=500)
@@ -14,6 +63,227 @@ class Incident(models.Model):
         null=True,
         help_text='Latitude, Longitude (e.g. "47.6567, -117.4234")',
     )
+    # supplied by API clients so a retried submission is never counted twice
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    # derived from location and coordinates on save; bulk writers call
+    # assign_location_keys() themselves
+    location_key = models.CharField(
+        max_length=100, db_index=True, blank=True, editable=False
+    )
+    grid_cell = models.CharField(max_length=32, null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
 
     def __str__(self):
         return f"{self.location}"
+
+    def assign_location_keys(self):
+        self.location_key = normalize_location(self.location)
+        self.grid_cell = grid_cell(self.coordinates)
+
+    def save(self, *args, **kwargs):
+        self.assign_location_keys()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "location_key", "grid_cell"}
+        super().save(*args, **kwargs)
+
+
+class Incident(IncidentRecord):
+    class Meta:
+        indexes = [
+            # every dashboard query is one region's slice of a date range
+            models.Index(
+                fields=["region", "datetime"], name="incident_region_datetime_idx"
+            ),
+            # fatal rows are a small subset; the fatal incidents page reads only this
+            models.Index(
+                fields=["region", "-datetime", "-id"],
+                condition=Q(fatal_incident=True),
+                name="incident_fatal_region_idx",
+            ),
+            # the admin's UPPER(location) prefix-search index needs a PostgreSQL
+            # operator class, so migration 0021 creates it outside this list
+        ]
+
+
+class ArchivedIncident(IncidentRecord):
+    """An incident moved out of the hot table by `manage.py archive_incidents`."""
+
+    id = models.BigIntegerField(primary_key=True)  # the original Incident id
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["region", "datetime"], name="archived_region_datetime_idx"
+            ),
+            models.Index(
+                fields=["region", "-datetime", "-id"],
+                condition=Q(fatal_incident=True),
+                name="archived_fatal_region_idx",
+            ),
+        ]
+
+
+class MonthIndex(models.Model):
+    """One row per region and calendar month with incidents, kept current on writes."""
+
+    region = models.ForeignKey(Region, on_delete=models.CASCADE)
+    month = models.DateField()  # first day of the month
+    incident_count = models.IntegerField(default=0)
+    affected_total = models.IntegerField(default=0)
+    fatal_count = models.IntegerField(default=0)
+    narcan_total = models.IntegerField(default=0)
+    first_datetime = models.DateTimeField()
+    last_datetime = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("month",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["region", "month"], name="unique_region_month"
+            ),
+        ]
+
+    def __str__(self):
+        return self.month.strftime("%Y-%m")
+
+
+class Job(models.Model):
+    """Deferred post-write work, run by the `run_jobs` management command."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    # pending jobs with the same kind and key are coalesced into one
+    key = models.CharField(max_length=100, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "key"],
+                condition=Q(status="pending"),
+                name="unique_pending_job",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key} ({self.status})"
+
+
+class IncidentChange(models.Model):
+    """Append-only log of incident inserts, updates and deletes for downstream sync."""
+
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+    OPERATION_CHOICES = [(INSERT, "Insert"), (UPDATE, "Update"), (DELETE, "Delete")]
+
+    seq = models.BigAutoField(primary_key=True)
+    incident_id = models.BigIntegerField(db_index=True)
+    operation = models.CharField(max_length=6, choices=OPERATION_CHOICES)
+    # the incident as of this change; empty for deletes
+    data = models.JSONField(null=True, blank=True)
+    recorded_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"#{self.seq} {self.operation} incident {self.incident_id}"
+
+
+class ApiToken(models.Model):
+    """Bearer token for the JSON API, acting as the linked user."""
+
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=64, unique=True, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = secrets.token_hex(20)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class AnalyticsSummary(models.Model):
+    """Headline results of the offline `analytics_report` job, read by the dashboard."""
+
+    metric = models.CharField(max_length=100, unique=True)
+    value = models.FloatField(null=True, blank=True)
+    detail = models.JSONField(default=dict, blank=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "analytics summaries"
+
+    def __str__(self):
+        return self.metric
+
+
+class DailyTotal(models.Model):
+    """Incidents per region and day, kept current on writes with F() deltas."""
+
+    region = models.ForeignKey(Region, on_delete=models.CASCADE)
+    day = models.DateField()
+    incident_count = models.IntegerField(default=0)
+    affected_total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["region", "day"], name="unique_region_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.region_id}: {self.day}"
+
+
+class HotspotCount(models.Model):
+    """Monthly totals per normalized location or grid cell, kept current on writes."""
+
+    LOCATION = "location"
+    CELL = "cell"
+    KIND_CHOICES = [(LOCATION, "Location"), (CELL, "Grid cell")]
+
+    region = models.ForeignKey(Region, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=100)
+    month = models.DateField()  # first day of the month
+    label = models.CharField(max_length=100)  # a spelling to display for the key
+    incident_count = models.IntegerField(default=0)
+    affected_total = models.IntegerField(default=0)
+    fatal_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["region", "kind", "key", "month"], name="unique_hotspot_month"
+            ),
+        ]
+        indexes = [models.Index(fields=["region", "kind", "month"])]
+
+    def __str__(self):
+        return f"{self.label} ({self.month:%B %Y})"
@@ -0,0 +1,121 @@
+"""Month catalogue backing the period picker and earliest-record lookups.
+
+`MonthIndex` holds one row per region and month with data. Writes refresh
+the affected months with a single ranged aggregate each (per table, once a
+month has been archived), and readers share one cached copy of a region's
+(tiny) catalogue instead of scanning the incident tables for min() values.
+
+The cached copy is keyed on a version read from `MonthIndex` itself (its row
+count and newest `updated_at`), so a refresh made by any process, or a cache
+that isn't shared between processes, never serves a stale catalogue.
+"""
+
+from datetime import date, datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import MonthIndex
+from .regions import get_region_ids
+from .storage import aggregate_incidents, group_incidents, incident_querysets
+
+CACHE_KEY = "month_index"
+# bump whenever MonthIndex changes shape, so catalogues cached by older code
+# (pickled without the new fields) are never read back
+CACHE_VERSION = 2
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def month_bounds(month):
+    start = datetime(month.year, month.month, 1)
+    if month.month == 12:
+        end = datetime(month.year + 1, 1, 1)
+    else:
+        end = datetime(month.year, month.month + 1, 1)
+    return start, end
+
+
+def _month_aggregates():
+    return {
+        "incident_count": Count("id"),
+        "affected_total": Sum("number_affected"),
+        "fatal_count": Count("id", filter=Q(fatal_incident=True)),
+        "narcan_total": Sum("narcan_doses_administered", default=0),
+        "first_datetime": Min("datetime"),
+        "last_datetime": Max("datetime"),
+    }
+
+
+def refresh_months(region_id, months):
+    for month in {month_start(m) for m in months if m is not None}:
+        start, end = month_bounds(month)
+        totals = aggregate_incidents(
+            incident_querysets(start, region_id=region_id, datetime__lt=end),
+            **_month_aggregates(),
+        )
+        if totals["incident_count"]:
+            MonthIndex.objects.update_or_create(
+                region_id=region_id, month=month, defaults=totals
+            )
+        else:
+            MonthIndex.objects.filter(region_id=region_id, month=month).delete()
+
+
+def rebuild_month_index():
+    entries = []
+    for region_id in get_region_ids():
+        groups = group_incidents(
+            incident_querysets(region_id=region_id),
+            "month",
+            TruncMonth("datetime"),
+            **_month_aggregates(),
+        )
+        entries.extend(
+            MonthIndex(region_id=region_id, month=month_start(month), **totals)
+            for month, totals in groups.items()
+        )
+    with transaction.atomic():
+        MonthIndex.objects.all().delete()
+        MonthIndex.objects.bulk_create(entries)
+    return len(entries)
+
+
+def get_catalogue_version(region_id):
+    """A token that changes whenever any of the region's months is refreshed or removed.
+
+    It is read from the database on every call (one aggregate over the region's
+    few catalogue rows), so every process sees every other process's refreshes.
+    """
+    latest = MonthIndex.objects.filter(region_id=region_id).aggregate(
+        count=Count("id"), updated_at=Max("updated_at")
+    )
+    if not latest["count"]:
+        return "empty"
+    return f"{latest['count']}-{latest['updated_at'].isoformat()}"
+
+
+def get_month_catalogue(region_id):
+    key = f"{CACHE_KEY}:{region_id}:{get_catalogue_version(region_id)}"
+    catalogue = cache.get(key, version=CACHE_VERSION)
+    if catalogue is None:
+        catalogue = list(MonthIndex.objects.filter(region_id=region_id))
+        cache.set(key, catalogue, CACHE_TIMEOUT, version=CACHE_VERSION)
+    return catalogue
+
+
+def get_month_entry(region_id, year, month):
+    for entry in get_month_catalogue(region_id):
+        if entry.month.year == year and entry.month.month == month:
+            return entry
+    return None
+
+
+def get_earliest_incident_datetime(region_id):
+    catalogue = get_month_catalogue(region_id)
+    return catalogue[0].first_datetime if catalogue else None
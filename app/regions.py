@@ -0,0 +1,56 @@
+"""Regions sharing one deployment.
+
+Every incident belongs to a region, and every derived table and cache is
+kept per region, so one region's dashboard reads only its own slice of the
+`(region, datetime)` indexes whatever else shares the database. The region
+list itself is tiny and cached for a few minutes; saving or deleting a region
+drops it at once in the process that made the change.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Region
+
+CACHE_KEY = "regions"
+CACHE_TIMEOUT = 60 * 5
+
+
+def get_regions():
+    regions = cache.get(CACHE_KEY)
+    if regions is None:
+        regions = list(Region.objects.all())
+        cache.set(CACHE_KEY, regions, CACHE_TIMEOUT)
+    return regions
+
+
+def get_region_ids():
+    return [region.id for region in get_regions()]
+
+
+def get_default_region():
+    for region in get_regions():
+        if region.slug == settings.DEFAULT_REGION:
+            return region
+    return None
+
+
+def get_region(slug=None):
+    """The region with this slug, else the default region (None if there are none)."""
+    regions = get_regions()
+    for wanted in (slug, settings.DEFAULT_REGION):
+        for region in regions:
+            if region.slug == wanted:
+                return region
+    return regions[0] if regions else None
+
+
+def get_region_by_id(region_id):
+    for region in get_regions():
+        if region.id == region_id:
+            return region
+    return None
+
+
+def invalidate():
+    cache.delete(CACHE_KEY)
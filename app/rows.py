@@ -0,0 +1,55 @@
+"""Lightweight read path for incident listings.
+
+Dashboard lists only need a handful of columns, so rather than building a
+full model instance per incident they fetch tuples with `values_list` and
+wrap them in `IncidentRow`, a `__slots__` record the templates and view
+helpers read exactly like an `Incident`.
+"""
+
+INCIDENT_ROW_FIELDS = (
+    "id",
+    "datetime",
+    "location",
+    "number_affected",
+    "narcan_doses_administered",
+    "report_text",
+    "fatal_incident",
+    "coordinates",
+)
+
+
+class IncidentRow:
+    __slots__ = INCIDENT_ROW_FIELDS + ("incident_this_month",)
+
+    def __init__(
+        self,
+        id,
+        datetime,
+        location,
+        number_affected,
+        narcan_doses_administered,
+        report_text,
+        fatal_incident,
+        coordinates,
+    ):
+        self.id = id
+        self.datetime = datetime
+        self.location = location
+        self.number_affected = number_affected
+        self.narcan_doses_administered = narcan_doses_administered
+        self.report_text = report_text
+        self.fatal_incident = fatal_incident
+        self.coordinates = coordinates
+        self.incident_this_month = None
+
+    def __str__(self):
+        return f"{self.location}"
+
+
+def fetch_incident_rows(queryset, chunk_size=2000):
+    return [
+        IncidentRow(*values)
+        for values in queryset.values_list(*INCIDENT_ROW_FIELDS).iterator(
+            chunk_size=chunk_size
+        )
+    ]
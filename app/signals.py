@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import changes, hotspots, jobs, month_index, regions, storage, trends
+from .models import Incident, IncidentChange, Region
+
+
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+def region_changed(sender, **kwargs):
+    regions.invalidate()
+
+
+@receiver(pre_save, sender=Incident)
+def remember_previous_values(sender, instance, raw=False, **kwargs):
+    # an edit can move an incident to another month or region or clear its fatal flag,
+    # so the derived data for the old values needs refreshing too
+    instance._previous_values = None
+    if not raw and instance.pk is not None:
+        instance._previous_values = (
+            Incident.objects.filter(pk=instance.pk)
+            .values(*hotspots.HOTSPOT_FIELDS)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Incident)
+def incident_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_values", None) or {}
+    changes.record_change(
+        IncidentChange.INSERT if created else IncidentChange.UPDATE, instance
+    )
+    month_index.refresh_months(instance.region_id, [instance.datetime])
+    values = hotspots.incident_values(instance)
+    if previous:
+        hotspots.record_delta(previous, -1)
+        trends.record_delta(previous, -1)
+    hotspots.record_delta(values, 1)
+    trends.record_delta(values, 1)
+    if previous:
+        # the edit may have moved the incident to another month or region
+        month_index.refresh_months(previous["region_id"], [previous["datetime"]])
+    transaction.on_commit(lambda: enqueue_post_write_jobs(instance, previous))
+
+
+@receiver(post_delete, sender=Incident)
+def incident_deleted(sender, instance, **kwargs):
+    if storage.is_archiving():
+        return
+    changes.record_change(IncidentChange.DELETE, instance)
+    month_index.refresh_months(instance.region_id, [instance.datetime])
+    values = hotspots.incident_values(instance)
+    hotspots.record_delta(values, -1)
+    trends.record_delta(values, -1)
+    transaction.on_commit(
+        lambda: jobs.enqueue_month_refresh(instance.region_id, instance.datetime)
+    )
+
+
+def enqueue_post_write_jobs(instance, previous):
+    jobs.enqueue_month_refresh(instance.region_id, instance.datetime)
+    if previous:
+        jobs.enqueue_month_refresh(previous["region_id"], previous["datetime"])
+    if instance.coordinates:
+        jobs.enqueue(
+            "parse_coordinates",
+            key=str(instance.pk),
+            payload={"incident_id": instance.pk},
+        )
@@ -0,0 +1,147 @@
+"""Hot/cold storage for incidents.
+
+`manage.py archive_incidents` moves whole months older than the archive
+horizon from `Incident` into `ArchivedIncident`, keeping their ids. Readers
+go through `incident_querysets()`, which always includes the hot table
+(it can still receive back-dated incidents) and adds the archive only when
+the period starts before last month. Nothing newer is ever archived, so
+that test needs no lookup and no cached boundary that other processes
+could hold stale: the current month never touches the archive, and an
+older period that the archive hasn't reached yet costs one empty index
+range. Aggregates and grouped totals are run per table and merged here.
+"""
+
+import threading
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+
+from .models import ArchivedIncident, Incident
+from .rows import fetch_incident_rows
+
+DEFAULT_ARCHIVE_AFTER_MONTHS = 24
+# readers rely on last month and this one never being archived
+MIN_ARCHIVE_AFTER_MONTHS = 1
+ARCHIVE_FIELDS = [field.attname for field in Incident._meta.concrete_fields]
+
+_archiving = threading.local()
+
+
+def get_archive_after_months():
+    return getattr(settings, "INCIDENT_ARCHIVE_AFTER_MONTHS", DEFAULT_ARCHIVE_AFTER_MONTHS)
+
+
+def get_archive_cutoff(months=None, today=None):
+    """Start of the oldest month kept hot; everything before it is archived."""
+    months = get_archive_after_months() if months is None else months
+    today = today or date.today()
+    month_number = today.year * 12 + today.month - 1 - months
+    return datetime(month_number // 12, month_number % 12 + 1, 1)
+
+
+def is_archiving():
+    return getattr(_archiving, "active", False)
+
+
+def archive_incidents(before, batch_size=1000):
+    """Move incidents older than `before` into the archive; returns the count.
+
+    `before` is capped at the start of last month, whatever is passed.
+    """
+    before = min(before, get_archive_cutoff(MIN_ARCHIVE_AFTER_MONTHS))
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Incident.objects.select_for_update()
+                .filter(datetime__lt=before)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            batch = Incident.objects.filter(id__in=ids)
+            ArchivedIncident.objects.bulk_create(
+                ArchivedIncident(**values) for values in batch.values(*ARCHIVE_FIELDS)
+            )
+            # the incidents still exist, so the change feed and derived data
+            # must not see these deletes
+            _archiving.active = True
+            try:
+                batch.delete()
+            finally:
+                _archiving.active = False
+        moved += len(ids)
+    return moved
+
+
+def get_incident_models(since=None):
+    if since is not None and since >= get_archive_cutoff(MIN_ARCHIVE_AFTER_MONTHS):
+        return [Incident]
+    return [ArchivedIncident, Incident]
+
+
+def incident_querysets(since=None, **filters):
+    """One queryset per table holding incidents at or after `since`."""
+    if since is not None:
+        filters["datetime__gte"] = since
+    return [model.objects.filter(**filters) for model in get_incident_models(since)]
+
+
+def fetch_period_rows(region_id, since=None, until=None, query=None):
+    """A region's incidents in [since, until], oldest first, from both tables."""
+    filters = {"region_id": region_id}
+    if until is not None:
+        filters["datetime__lte"] = until
+    if query is not None:
+        filters["location__icontains"] = query
+    querysets = incident_querysets(since, **filters)
+    rows = []
+    for queryset in querysets:
+        rows.extend(fetch_incident_rows(queryset.order_by("datetime")))
+    if len(querysets) > 1:
+        # back-dated hot rows can interleave with archived ones; nearly sorted already
+        rows.sort(key=lambda row: row.datetime)
+    return rows
+
+
+def _merge(aggregate, current, value):
+    if value is None:
+        return current
+    if current is None:
+        return value
+    if isinstance(aggregate, (Count, Sum)):
+        return current + value
+    if isinstance(aggregate, Min):
+        return min(current, value)
+    if isinstance(aggregate, Max):
+        return max(current, value)
+    raise TypeError(f"Can't merge {type(aggregate).__name__} across tables")
+
+
+def aggregate_incidents(querysets, **aggregates):
+    """`QuerySet.aggregate()` across tables; supports Count, Sum, Min and Max."""
+    totals = dict.fromkeys(aggregates)
+    for queryset in querysets:
+        for name, value in queryset.aggregate(**aggregates).items():
+            totals[name] = _merge(aggregates[name], totals[name], value)
+    return totals
+
+
+def group_incidents(querysets, group_by, expression, **aggregates):
+    """Aggregates per `expression` value across tables, as {value: totals}."""
+    groups = {}
+    for queryset in querysets:
+        rows = (
+            queryset.annotate(**{group_by: expression})
+            .values(group_by)
+            .annotate(**aggregates)
+            .order_by()
+        )
+        for row in rows:
+            totals = groups.setdefault(row[group_by], dict.fromkeys(aggregates))
+            for name, aggregate in aggregates.items():
+                totals[name] = _merge(aggregate, totals[name], row[name])
+    return dict(sorted(groups.items()))
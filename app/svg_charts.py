@@ -0,0 +1,121 @@
+"""Small SVG bar chart renderer for the dashboard charts.
+
+Produces self-contained, accessible <svg> markup (title, description and a
+tooltip per bar) straight from the label/value series, so the simple bar
+charts don't need matplotlib's figure, layout and PNG encoding machinery.
+Every bar is its own element, so callers keep series within `max_bars()`.
+"""
+
+import math
+from html import escape
+
+MARGIN_LEFT = 56
+MARGIN_RIGHT = 12
+MARGIN_TOP = 32
+MARGIN_BOTTOM = 64
+# narrower bars are below a pixel once the gap between them is taken out
+MIN_BAR_SLOT = 4
+
+
+def nice_ticks(maximum, target=5):
+    """Round y-axis tick positions from 0 to at least `maximum`."""
+    if maximum <= 0:
+        return [0, 1]
+    raw_step = maximum / target
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    for multiple in (1, 2, 5, 10):
+        step = multiple * magnitude
+        if step >= raw_step:
+            break
+    step = max(1, step) if float(maximum).is_integer() else step
+    top = math.ceil(maximum / step) * step
+    return [round(i * step, 10) for i in range(int(round(top / step)) + 1)]
+
+
+def max_bars(width=800):
+    """How many bars fit across a chart `width` pixels wide."""
+    return (width - MARGIN_LEFT - MARGIN_RIGHT) // MIN_BAR_SLOT
+
+
+def _format_number(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def render_bar_chart(
+    labels,
+    values,
+    title,
+    y_label,
+    color="teal",
+    tick_step=1,
+    value_labels=False,
+    chart_id="chart",
+    width=800,
+    height=350,
+):
+    labels = [str(label) for label in labels]
+    plot_width = width - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = height - MARGIN_TOP - MARGIN_BOTTOM
+    ticks = nice_ticks(max(values, default=0))
+    y_max = ticks[-1]
+    slot = plot_width / max(len(values), 1)
+    bar_width = max(slot * 0.8, 0.5)
+    baseline = MARGIN_TOP + plot_height
+
+    def y_position(value):
+        return baseline - value / y_max * plot_height
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" id="{chart_id}" '
+        f'viewBox="0 0 {width} {height}" width="{width}" height="{height}" role="img" '
+        f'aria-labelledby="{chart_id}-title {chart_id}-desc">',
+        f'<title id="{chart_id}-title">{escape(title)}</title>',
+        f'<desc id="{chart_id}-desc">{escape(y_label)} for {len(values)} categories, '
+        f"from {escape(labels[0]) if labels else 'none'} to "
+        f"{escape(labels[-1]) if labels else 'none'}; "
+        f"highest value {_format_number(max(values, default=0))}.</desc>",
+        # inline SVG styles apply page-wide, so scope them to this chart
+        f"<style>#{chart_id} .label{{font:11px sans-serif}}</style>",
+        f'<text x="{width / 2:.1f}" y="20" text-anchor="middle" '
+        f'style="font-family:sans-serif;font-size:14px">{escape(title)}</text>',
+    ]
+
+    for tick in ticks:
+        y = y_position(tick)
+        parts.append(
+            f'<line x1="{MARGIN_LEFT}" x2="{width - MARGIN_RIGHT}" y1="{y:.1f}" '
+            f'y2="{y:.1f}" stroke="#ddd"/>'
+            f'<text x="{MARGIN_LEFT - 6}" y="{y + 4:.1f}" text-anchor="end" '
+            f'class="label">{_format_number(tick)}</text>'
+        )
+    parts.append(
+        f'<text transform="translate(14 {MARGIN_TOP + plot_height / 2:.1f}) rotate(-90)" '
+        f'text-anchor="middle" class="label">{escape(y_label)}</text>'
+    )
+
+    for index, (label, value) in enumerate(zip(labels, values)):
+        x = MARGIN_LEFT + index * slot + (slot - bar_width) / 2
+        y = y_position(value)
+        if value:
+            parts.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" '
+                f'height="{baseline - y:.1f}" fill="{color}">'
+                f"<title>{escape(label)}: {_format_number(value)}</title></rect>"
+            )
+        if value_labels:
+            parts.append(
+                f'<text x="{x + bar_width / 2:.1f}" y="{y - 3:.1f}" '
+                f'text-anchor="middle" class="label">{_format_number(value)}</text>'
+            )
+        if index % tick_step == 0:
+            label_x = x + bar_width / 2
+            parts.append(
+                f'<text transform="translate({label_x:.1f} {baseline + 10}) rotate(-45)" '
+                f'text-anchor="end" class="label">{escape(label)}</text>'
+            )
+
+    parts.append(
+        f'<line x1="{MARGIN_LEFT}" x2="{width - MARGIN_RIGHT}" y1="{baseline}" '
+        f'y2="{baseline}" stroke="#333"/></svg>'
+    )
+    return "".join(parts)
@@ -0,0 +1,919 @@
+from datetime import date, datetime, time, timedelta
+from unittest import mock, skipUnless
+
+import numpy as np
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import analytics, fatalities, hotspots, jobs, month_index, trends
+from .changes import get_changes_since, get_settle_seconds
+from .comparisons import get_comparison_matrix
+from .hotspots import get_top_hotspots
+from .ingest import ingest_incidents
+from .locations import normalize_location
+from .models import (
+    AnalyticsSummary,
+    ArchivedIncident,
+    DailyTotal,
+    HotspotCount,
+    Incident,
+    IncidentChange,
+    Job,
+    MonthIndex,
+    Region,
+)
+from .regions import get_region
+from .rows import INCIDENT_ROW_FIELDS, fetch_incident_rows
+from .storage import (
+    archive_incidents,
+    fetch_period_rows,
+    get_archive_cutoff,
+    get_incident_models,
+)
+from .svg_charts import max_bars, nice_ticks, render_bar_chart
+from .views import bin_daily_totals
+
+
+def make_incident(**fields):
+    values = {
+        "region": get_region(),
+        "datetime": datetime.now().replace(microsecond=0),
+        "location": "Division St & 1st Ave",
+        "number_affected": 1,
+        "narcan_doses_administered": 1,
+        "report_text": "Report",
+        "fatal_incident": False,
+    }
+    values.update(fields)
+    return Incident.objects.create(**values)
+
+
+class CacheClearingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+
+class TrendStatsTests(CacheClearingTestCase):
+    def daily_totals(self):
+        return list(
+            DailyTotal.objects.order_by("region_id", "day").values_list(
+                "region_id", "day", "incident_count", "affected_total"
+            )
+        )
+
+    def test_writes_adjust_the_daily_rollup(self):
+        region_id = get_region().id
+        today = date.today()
+        first = make_incident(number_affected=2)
+        second = make_incident(number_affected=3)
+        self.assertEqual(self.daily_totals(), [(region_id, today, 2, 5)])
+        self.assertEqual(trends.get_trend_stats(region_id).current_total, 5)
+
+        second.datetime -= timedelta(days=1)
+        second.save()
+        first.delete()
+        expected = [(region_id, today - timedelta(days=1), 1, 3)]
+        self.assertEqual(self.daily_totals(), expected)
+        trends.rebuild_daily_totals()
+        self.assertEqual(self.daily_totals(), expected)
+
+    def test_reads_only_the_rollup(self):
+        region_id = get_region().id
+        make_incident(datetime=datetime.now() - timedelta(days=400))
+        make_incident()
+        with CaptureQueriesContext(connection) as context:
+            trends.get_trend_stats(region_id)
+        self.assertEqual(len(context.captured_queries), 2)
+        for query in context.captured_queries:
+            self.assertIn("app_dailytotal", query["sql"])
+
+    def test_recent_fold_matches_whole_history(self):
+        region = get_region()
+        today = date.today()
+        first_day = today - timedelta(days=400)
+        totals = np.random.default_rng(7).poisson(3, 401)
+        DailyTotal.objects.bulk_create(
+            DailyTotal(
+                region=region,
+                day=first_day + timedelta(days=offset),
+                incident_count=total,
+                affected_total=total,
+            )
+            for offset, total in enumerate(totals)
+            if total
+        )
+        whole = trends.TrendStats.from_daily_totals(first_day, totals)
+        recent = trends.get_trend_stats(region.id, today)
+        self.assertEqual(recent.summary(), whole.summary())
+        end_of_month = datetime(today.year, today.month, 28)
+        self.assertEqual(
+            recent.project_total(50, end_of_month),
+            whole.project_total(50, end_of_month),
+        )
+
+
+class TrendStatsMathTests(SimpleTestCase):
+    def test_closed_form_matches_incremental_fold(self):
+        first_day = date(2026, 1, 1)
+        # shorter than HOLT_WARMUP_DAYS, so both replay Holt from the first day
+        totals = [3, 0, 5, 2, 2, 7, 1, 0, 4] * 9
+        closed_form = trends.TrendStats.from_daily_totals(first_day, totals)
+        incremental = trends.TrendStats()
+        for offset, total in enumerate(totals):
+            incremental.advance_to(first_day + timedelta(days=offset))
+            incremental.current_total += total
+        self.assertEqual(closed_form.current_day, incremental.current_day)
+        self.assertEqual(closed_form.current_total, incremental.current_total)
+        self.assertEqual(closed_form.window_sums, incremental.window_sums)
+        self.assertEqual(list(closed_form.recent), list(incremental.recent))
+        self.assertAlmostEqual(closed_form.ewma, incremental.ewma)
+        self.assertAlmostEqual(closed_form.level, incremental.level)
+        self.assertAlmostEqual(closed_form.trend, incremental.trend)
+
+    def test_holt_projection_of_a_flat_series(self):
+        first_day = date(2026, 1, 1)
+        stats = trends.TrendStats.from_daily_totals(first_day, [4] * 30 + [1])
+        self.assertAlmostEqual(stats.level, 4)
+        self.assertAlmostEqual(stats.trend, 0)
+        end_of_period = datetime.combine(stats.current_day + timedelta(days=3), time())
+        # 3 more today, then 4 on each of the 3 remaining days
+        self.assertEqual(stats.project_total(10, end_of_period), 25)
+
+    def test_rolling_averages_with_short_history(self):
+        stats = trends.TrendStats.from_daily_totals(date(2026, 1, 1), [1, 2, 3, 9])
+        self.assertEqual(stats.rolling_averages(), {7: 2.0, 30: 2.0, 90: 2.0})
+        self.assertEqual(stats.day_over_day_delta(), 1)
+        self.assertEqual(stats.current_total, 9)
+
+
+class TrendSummaryTests(CacheClearingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user("viewer", password="pw"))
+        make_incident()
+
+    def test_shown_on_current_month(self):
+        response = self.client.get("/")
+        self.assertContains(response, "Weighted Recent Average ODs Per Day")
+
+    def test_hidden_on_past_month_and_search(self):
+        last_year = date.today().year - 1
+        make_incident(datetime=datetime(last_year, 6, 15, 12))
+        for params in ({"time_period": f"{last_year}-06"}, {"query": "Division"}):
+            response = self.client.get("/", params)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, "Weighted Recent Average ODs Per Day")
+
+
+class RecomputeCoordinatesTests(CacheClearingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "pw")
+        )
+
+    def test_unparseable_coordinates_are_kept(self):
+        messy = make_incident(coordinates="47.65,-117.42")
+        unparseable = make_incident(coordinates="47.65 -117.42")
+        response = self.client.post(
+            "/admin/app/incident/",
+            {
+                "action": "recompute_coordinates",
+                "_selected_action": [messy.pk, unparseable.pk],
+            },
+            follow=True,
+        )
+        messy.refresh_from_db()
+        unparseable.refresh_from_db()
+        self.assertEqual(messy.coordinates, "47.650000, -117.420000")
+        self.assertEqual(unparseable.coordinates, "47.65 -117.42")
+        self.assertContains(response, "left 1 with unparseable coordinates unchanged")
+
+    def test_search_is_case_insensitive(self):
+        make_incident(location="Division St & 1st Ave")
+        response = self.client.get("/admin/app/incident/", {"q": "division"})
+        self.assertContains(response, "Division St &amp; 1st Ave")
+
+
+class JobQueueTests(CacheClearingTestCase):
+    def test_parse_coordinates_keeps_unparseable_input(self):
+        incident = make_incident(coordinates="47.65 -117.42")
+        jobs.parse_coordinates(incident.pk)
+        incident.refresh_from_db()
+        self.assertEqual(incident.coordinates, "47.65 -117.42")
+
+    def test_parse_coordinates_normalizes(self):
+        incident = make_incident(coordinates="47.65,-117.42")
+        jobs.parse_coordinates(incident.pk)
+        incident.refresh_from_db()
+        self.assertEqual(incident.coordinates, "47.650000, -117.420000")
+
+    def test_refresh_month_only_reads_the_derived_tables(self):
+        incident = make_incident()
+        with CaptureQueriesContext(connection) as queries:
+            jobs.refresh_month(
+                incident.datetime.date().replace(day=1).isoformat(),
+                incident.region_id,
+            )
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertEqual(writes, [])
+
+    def test_claim_is_exclusive(self):
+        job = Job.objects.create(kind="refresh_month", key="a")
+        claimed = jobs.claim_next_job()
+        self.assertEqual(
+            (claimed.pk, claimed.status, claimed.attempts), (job.pk, Job.RUNNING, 1)
+        )
+        self.assertIsNone(jobs.claim_next_job())
+
+    def test_claim_lost_to_another_worker(self):
+        job = Job.objects.create(kind="refresh_month", key="a")
+        # another worker claims the job after this one has read it as pending
+        Job.objects.filter(pk=job.pk).update(status=Job.RUNNING)
+        with mock.patch(
+            "django.db.models.query.QuerySet.first", side_effect=[job, None]
+        ):
+            self.assertIsNone(jobs.claim_next_job())
+        self.assertEqual(Job.objects.get(pk=job.pk).attempts, 0)
+
+    def make_running_job(self, age_seconds, **fields):
+        job = Job.objects.create(kind="refresh_month", status=Job.RUNNING, **fields)
+        Job.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(seconds=age_seconds)
+        )
+        return job
+
+    def test_stale_running_jobs_are_requeued(self):
+        stale = self.make_running_job(jobs.LEASE_SECONDS + 60, key="stale", attempts=1)
+        fresh = self.make_running_job(60, key="fresh", attempts=1)
+        exhausted = self.make_running_job(
+            jobs.LEASE_SECONDS + 60, key="exhausted", attempts=jobs.MAX_ATTEMPTS
+        )
+        self.assertEqual(jobs.requeue_stale_jobs(), 1)
+        statuses = dict(Job.objects.values_list("key", "status"))
+        self.assertEqual(statuses[stale.key], Job.PENDING)
+        self.assertEqual(statuses[fresh.key], Job.RUNNING)
+        self.assertEqual(statuses[exhausted.key], Job.FAILED)
+        self.assertEqual(jobs.claim_next_job().pk, stale.pk)
+
+    def test_stale_job_dropped_when_identical_job_pending(self):
+        stale = self.make_running_job(jobs.LEASE_SECONDS + 60, key="a", attempts=1)
+        pending = Job.objects.create(kind="refresh_month", key="a")
+        jobs.requeue_stale_jobs()
+        self.assertFalse(Job.objects.filter(pk=stale.pk).exists())
+        self.assertTrue(Job.objects.filter(pk=pending.pk, status=Job.PENDING).exists())
+
+
+class ChangeFeedTests(CacheClearingTestCase):
+    def record(self, seq, recorded_at):
+        return IncidentChange.objects.create(
+            seq=seq,
+            incident_id=seq,
+            operation=IncidentChange.INSERT,
+            recorded_at=recorded_at,
+        )
+
+    def read(self, since, at):
+        with mock.patch("django.utils.timezone.now", return_value=at):
+            return get_changes_since(since)
+
+    def test_late_committing_lower_seq_is_delivered(self):
+        start = timezone.now()
+        settle = timedelta(seconds=get_settle_seconds())
+        self.record(11, start)
+        # seq 10 was assigned first but its transaction hasn't committed yet
+        batch = self.read(0, start + timedelta(seconds=1))
+        self.assertEqual(batch["changes"], [])
+        self.assertEqual(batch["next_since"], 0)
+
+        self.record(10, start - timedelta(seconds=1))
+        batch = self.read(batch["next_since"], start + settle + timedelta(seconds=1))
+        self.assertEqual([change["seq"] for change in batch["changes"]], [10, 11])
+        self.assertEqual(batch["next_since"], 11)
+
+    def test_settled_change_behind_unsettled_one_is_held_back(self):
+        now = timezone.now()
+        settle = timedelta(seconds=get_settle_seconds())
+        self.record(1, now - settle * 2)
+        self.record(2, now)
+        self.record(3, now - settle * 2)
+        batch = self.read(0, now)
+        self.assertEqual([change["seq"] for change in batch["changes"]], [1])
+        self.assertEqual(batch["next_since"], 1)
+
+
+class RegionDefaultTests(CacheClearingTestCase):
+    def test_default_region_is_not_queried_per_instance(self):
+        default = Region.objects.get(slug="spokane")
+        with self.assertNumQueries(1):
+            first = Incident(location="Main St")
+        with self.assertNumQueries(0):
+            others = [Incident(location="Main St") for _ in range(10)]
+        self.assertEqual(first.region_id, default.id)
+        self.assertTrue(all(incident.region_id == default.id for incident in others))
+
+    def test_api_returns_404_without_a_region(self):
+        self.client.force_login(User.objects.create_user("viewer", password="pw"))
+        for path in ("/api/hotspots/", "/api/compare/"):
+            self.assertEqual(
+                self.client.get(path, {"region": "nowhere"}).status_code, 404
+            )
+        MonthIndex.objects.all().delete()
+        Region.objects.all().delete()
+        for path in ("/api/hotspots/", "/api/compare/"):
+            self.assertEqual(self.client.get(path).status_code, 404)
+
+
+class MonthCatalogueCacheTests(CacheClearingTestCase):
+    def test_catalogue_cached_by_older_code_is_ignored(self):
+        region_id = get_region().id
+        make_incident(narcan_doses_administered=4)
+        version = month_index.get_catalogue_version(region_id)
+        cache.set(
+            f"{month_index.CACHE_KEY}:{region_id}:{version}",
+            ["stale"],
+            None,
+            version=month_index.CACHE_VERSION - 1,
+        )
+        catalogue = month_index.get_month_catalogue(region_id)
+        self.assertEqual([entry.narcan_total for entry in catalogue], [4])
+
+    def test_refresh_by_another_process_is_seen(self):
+        # no cache entry is deleted when the rows change, as when another
+        # process (with its own local cache) refreshes the month
+        region = get_region()
+        make_incident(datetime=datetime(2026, 3, 5, 10, 0), fatal_incident=True)
+        self.assertIsNone(month_index.get_month_entry(region.id, 2026, 4))
+        self.assertEqual(fatalities.get_fatal_stats(region.id)["total"], 1)
+        Incident.objects.bulk_create(
+            [
+                Incident(
+                    region=region,
+                    location="Main St",
+                    datetime=datetime(2026, 4, 2, 10, 0),
+                    number_affected=1,
+                    fatal_incident=True,
+                )
+            ]
+        )
+        month_index.refresh_months(region.id, [date(2026, 4, 1)])
+        self.assertIsNotNone(month_index.get_month_entry(region.id, 2026, 4))
+        self.assertEqual(fatalities.get_fatal_stats(region.id)["total"], 2)
+
+    def test_cached_catalogue_costs_one_version_query(self):
+        region_id = get_region().id
+        make_incident()
+        month_index.get_month_catalogue(region_id)
+        with self.assertNumQueries(1):
+            month_index.get_month_catalogue(region_id)
+
+
+def submission(**fields):
+    return {
+        "location": "Division St & 1st Ave",
+        "datetime": "2026-01-15 10:30:00",
+        "number_affected": 1,
+        "narcan_doses_administered": 2,
+        "report_text": "Report",
+        "fatal_incident": False,
+        **fields,
+    }
+
+
+def make_region(slug="stevens"):
+    return Region.objects.create(
+        slug=slug,
+        name=slug.title(),
+        center_latitude=48.0,
+        center_longitude=-117.9,
+    )
+
+
+class IngestTests(CacheClearingTestCase):
+    def test_retried_batch_is_not_counted_twice(self):
+        batch = [
+            submission(idempotency_key="a"),
+            submission(idempotency_key="b"),
+            submission(idempotency_key="a"),
+        ]
+        statuses = [result["status"] for result in ingest_incidents(batch)]
+        self.assertEqual(statuses, ["created", "created", "duplicate"])
+        retried = ingest_incidents(batch)
+        self.assertEqual([result["status"] for result in retried], ["duplicate"] * 3)
+        self.assertEqual(Incident.objects.count(), 2)
+        self.assertEqual(
+            IncidentChange.objects.filter(operation=IncidentChange.INSERT).count(), 2
+        )
+
+    def test_key_of_archived_incident_is_a_duplicate(self):
+        ingest_incidents(
+            [submission(idempotency_key="old", datetime="2020-03-01 09:00")]
+        )
+        archive_incidents(datetime(2021, 1, 1))
+        result = ingest_incidents([submission(idempotency_key="old")])[0]
+        self.assertEqual(result["status"], "duplicate")
+        self.assertEqual(Incident.objects.count(), 0)
+
+    def test_non_scalar_values_are_invalid_items(self):
+        results = ingest_incidents(
+            [
+                submission(region=["x"]),
+                submission(region={"slug": "spokane"}),
+                submission(datetime=["2026-10-01", "10:00"]),
+                submission(location={"street": "Main St"}),
+                submission(),
+            ]
+        )
+        self.assertEqual(
+            [result["status"] for result in results], ["invalid"] * 4 + ["created"]
+        )
+        self.assertEqual(list(results[0]["errors"]), ["region"])
+        self.assertEqual(list(results[1]["errors"]), ["region"])
+        self.assertEqual(list(results[2]["errors"]), ["datetime"])
+        self.assertEqual(list(results[3]["errors"]), ["location"])
+        self.assertEqual(Incident.objects.count(), 1)
+
+    def test_region_is_resolved_by_slug(self):
+        stevens = make_region()
+        results = ingest_incidents(
+            [submission(region="stevens"), submission(), submission(region="nowhere")]
+        )
+        self.assertEqual(
+            [result["status"] for result in results], ["created", "created", "invalid"]
+        )
+        self.assertEqual(
+            sorted(Incident.objects.values_list("region_id", flat=True)),
+            sorted([stevens.id, get_region().id]),
+        )
+
+
+class LocationKeyTests(SimpleTestCase):
+    def test_spellings_of_one_intersection_share_a_key(self):
+        for location in (
+            "1st Ave & Division St.",
+            "Division Street and First Avenue",
+            "division st / 1st ave",
+            "DIVISION ST @ 1ST AVE",
+            "1st Avenue at Division Street",
+        ):
+            self.assertEqual(normalize_location(location), "1st ave & division st")
+
+    def test_blocks_directions_and_blanks(self):
+        self.assertEqual(
+            normalize_location("100 Block of North Main Street"), "n main st"
+        )
+        self.assertEqual(normalize_location("1200 block E Sprague Av"), "e sprague ave")
+        self.assertEqual(normalize_location(""), "")
+        self.assertEqual(normalize_location(None), "")
+        self.assertEqual(normalize_location("  &  "), "")
+        self.assertLessEqual(len(normalize_location("Main St " * 40)), 100)
+
+
+class HotspotDeltaTests(CacheClearingTestCase):
+    def counts(self):
+        return sorted(
+            HotspotCount.objects.values_list(
+                "region_id",
+                "kind",
+                "key",
+                "month",
+                "incident_count",
+                "affected_total",
+                "fatal_count",
+            )
+        )
+
+    def test_incremental_counts_match_a_rebuild(self):
+        stevens = make_region()
+        march = datetime(2026, 3, 10, 9, 0)
+        incidents = [
+            make_incident(
+                datetime=march + timedelta(days=index * 9),
+                location=("Division St & 1st Ave", "1st Avenue and Division Street")[
+                    index % 2
+                ],
+                coordinates=f"47.6{index % 3}, -117.4{index % 2}",
+                number_affected=index % 3 + 1,
+                fatal_incident=index % 4 == 0,
+            )
+            for index in range(8)
+        ]
+        # edits move incidents between months, keys, cells and regions
+        incidents[0].location = "Main St"
+        incidents[0].save()
+        incidents[1].datetime = datetime(2026, 1, 2, 9, 0)
+        incidents[1].fatal_incident = True
+        incidents[1].save()
+        incidents[2].coordinates = None
+        incidents[2].number_affected = 5
+        incidents[2].save()
+        incidents[3].region = stevens
+        incidents[3].save()
+        incidents[4].delete()
+        incidents[5].location = ""
+        incidents[5].save()
+        incremental = self.counts()
+        self.assertTrue(incremental)
+        self.assertFalse(HotspotCount.objects.filter(incident_count__lte=0).exists())
+        hotspots.rebuild_hotspots()
+        self.assertEqual(self.counts(), incremental)
+
+
+class ArchiveTests(CacheClearingTestCase):
+    def snapshot(self, region_id):
+        cache.clear()
+        return {
+            "months": [
+                (entry.month, entry.incident_count, entry.narcan_total)
+                for entry in month_index.get_month_catalogue(region_id)
+            ],
+            "rows": [
+                (row.id, row.location, row.datetime)
+                for row in fetch_period_rows(region_id)
+            ],
+            "fatal_total": fatalities.get_fatal_stats(region_id)["total"],
+            "hotspots": get_top_hotspots(region_id),
+            "matrix": get_comparison_matrix(region_id),
+        }
+
+    def test_archiving_keeps_every_read_unchanged(self):
+        region_id = get_region().id
+        now = datetime.now().replace(microsecond=0)
+        for months_ago in (40, 30, 28, 1, 0):
+            make_incident(
+                datetime=now - timedelta(days=31 * months_ago),
+                fatal_incident=months_ago % 2 == 0,
+                location=f"{months_ago} Main St",
+            )
+        before = self.snapshot(region_id)
+        moved = archive_incidents(get_archive_cutoff())
+        self.assertEqual(moved, 3)
+        self.assertEqual(ArchivedIncident.objects.count(), 3)
+        self.assertEqual(self.snapshot(region_id), before)
+        # the incidents still exist, so the feed doesn't report them deleted
+        self.assertFalse(
+            IncidentChange.objects.filter(operation=IncidentChange.DELETE).exists()
+        )
+
+
+class IncidentRowTests(CacheClearingTestCase):
+    def test_rows_read_like_incidents(self):
+        incidents = [
+            make_incident(
+                datetime=datetime(2026, 2, day, 9, 0),
+                location=f"{day} Main St",
+                coordinates="47.650000, -117.420000" if day % 2 else None,
+                fatal_incident=day == 3,
+            )
+            for day in (3, 1, 2)
+        ]
+        with self.assertNumQueries(1):
+            rows = fetch_incident_rows(Incident.objects.order_by("datetime"))
+        incidents.sort(key=lambda incident: incident.datetime)
+        for row, incident in zip(rows, incidents, strict=True):
+            for field in INCIDENT_ROW_FIELDS:
+                self.assertEqual(getattr(row, field), getattr(incident, field))
+            self.assertEqual(str(row), str(incident))
+            self.assertIsNone(row.incident_this_month)
+
+    def test_rows_carry_no_instance_dict(self):
+        row = fetch_incident_rows(Incident.objects.filter(pk=make_incident().pk))[0]
+        row.incident_this_month = 1
+        with self.assertRaises(AttributeError):
+            row.region = get_region()
+
+    def test_period_rows_merge_both_tables_in_order(self):
+        region_id = get_region().id
+        now = datetime.now().replace(microsecond=0)
+        for months_ago in (40, 30, 1, 0):
+            make_incident(
+                datetime=now - timedelta(days=31 * months_ago),
+                location=f"{months_ago} Main St" if months_ago else "Elm St",
+            )
+        archive_incidents(get_archive_cutoff())
+        rows = fetch_period_rows(region_id)
+        self.assertEqual(
+            [row.location for row in rows],
+            ["40 Main St", "30 Main St", "1 Main St", "Elm St"],
+        )
+        self.assertEqual(
+            [row.location for row in fetch_period_rows(region_id, query="main")],
+            ["40 Main St", "30 Main St", "1 Main St"],
+        )
+        since = now - timedelta(days=31 * 35)
+        self.assertEqual(len(fetch_period_rows(region_id, since, now)), 3)
+
+
+class FatalPaginationTests(CacheClearingTestCase):
+    def walk(self, region_id, page_size):
+        ids, cursor = [], None
+        while True:
+            page, cursor = fatalities.get_fatal_incidents_page(
+                region_id, cursor, page_size=page_size
+            )
+            ids.extend(incident.id for incident in page)
+            if cursor is None:
+                return ids
+
+    def test_pages_cross_the_archive_boundary(self):
+        region_id = get_region().id
+        now = datetime.now().replace(microsecond=0)
+        tied = now - timedelta(days=31 * 30)
+        moments = [now - timedelta(days=31 * months_ago) for months_ago in (40, 1, 0)]
+        for moment in moments + [tied, tied, tied]:
+            make_incident(datetime=moment, fatal_incident=True)
+        make_incident(datetime=tied, fatal_incident=False)
+        make_incident(region=make_region(), datetime=now, fatal_incident=True)
+        expected = list(
+            Incident.objects.filter(region_id=region_id, fatal_incident=True)
+            .order_by("-datetime", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(archive_incidents(get_archive_cutoff()), 5)
+        for page_size in (1, 2, 4, 6, 25):
+            self.assertEqual(self.walk(region_id, page_size), expected)
+
+    def test_malformed_cursor_starts_from_the_first_page(self):
+        region_id = get_region().id
+        newest = make_incident(fatal_incident=True)
+        for cursor in ("nonsense", "2026-13-01T00:00:00_1", "2026-01-01T00:00:00_x"):
+            page, _ = fatalities.get_fatal_incidents_page(region_id, cursor)
+            self.assertEqual([incident.id for incident in page], [newest.id])
+
+
+class ArchiveBoundaryTests(CacheClearingTestCase):
+    def test_archive_run_elsewhere_is_seen(self):
+        region_id = get_region().id
+        now = datetime.now().replace(microsecond=0)
+        for months_ago in (40, 30, 0):
+            make_incident(datetime=now - timedelta(days=31 * months_ago))
+        since = now - timedelta(days=31 * 35)
+        archive_incidents(since)
+        self.assertEqual(len(fetch_period_rows(region_id, since)), 2)
+        # the archiving process's cache deletes never reach this one
+        with mock.patch.object(cache, "delete"), mock.patch.object(
+            cache, "delete_many"
+        ):
+            self.assertEqual(archive_incidents(get_archive_cutoff()), 1)
+        self.assertEqual(len(fetch_period_rows(region_id, since)), 2)
+        self.assertEqual(len(fetch_period_rows(region_id)), 3)
+
+    def test_recent_periods_never_read_the_archive(self):
+        make_incident(datetime=datetime(2020, 1, 1, 10, 0))
+        archive_incidents(datetime(2021, 1, 1))
+        with self.assertNumQueries(0):
+            models = get_incident_models(get_archive_cutoff(1))
+        self.assertEqual(models, [Incident])
+        self.assertEqual(
+            get_incident_models(get_archive_cutoff(2)), [ArchivedIncident, Incident]
+        )
+
+    def test_last_month_is_never_archived(self):
+        last_month = get_archive_cutoff(1) + timedelta(days=3)
+        make_incident(datetime=last_month)
+        self.assertEqual(archive_incidents(datetime.now()), 0)
+        self.assertEqual(Incident.objects.count(), 1)
+
+
+class RegionScopingTests(CacheClearingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.spokane = get_region()
+        self.stevens = make_region()
+        make_incident(location="Division St", fatal_incident=True)
+        make_incident(region=self.stevens, location="Main St", number_affected=3)
+
+    def test_derived_data_is_kept_per_region(self):
+        for region, location, affected, fatal in (
+            (self.spokane, "division st", 1, 1),
+            (self.stevens, "main st", 3, 0),
+        ):
+            catalogue = month_index.get_month_catalogue(region.id)
+            self.assertEqual([entry.affected_total for entry in catalogue], [affected])
+            self.assertEqual(
+                [row["key"] for row in get_top_hotspots(region.id)], [location]
+            )
+            self.assertEqual(fatalities.get_fatal_stats(region.id)["total"], fatal)
+
+    def test_moving_an_incident_updates_both_regions(self):
+        incident = Incident.objects.get(location="Main St")
+        incident.region = self.spokane
+        incident.save()
+        self.assertEqual(month_index.get_month_catalogue(self.stevens.id), [])
+        self.assertEqual(get_top_hotspots(self.stevens.id), [])
+        self.assertEqual(
+            sorted(row["key"] for row in get_top_hotspots(self.spokane.id)),
+            ["division st", "main st"],
+        )
+
+    def test_api_and_pages_follow_the_selected_region(self):
+        self.client.force_login(User.objects.create_user("viewer", password="pw"))
+        response = self.client.get("/api/hotspots/", {"region": "stevens"})
+        self.assertEqual(
+            [row["key"] for row in response.json()["hotspots"]], ["main st"]
+        )
+        self.client.get("/", {"region": "stevens"})
+        response = self.client.get("/fatal/")
+        self.assertContains(response, "Fatal Incidents Across All Time: Stevens")
+
+    def test_global_analytics_are_labelled_as_all_regions(self):
+        AnalyticsSummary.objects.create(
+            metric="peak_hour_weekday",
+            value=4,
+            detail={"weekday": "Friday", "hour": 22},
+        )
+        self.client.force_login(User.objects.create_user("viewer", password="pw"))
+        response = self.client.get("/", {"region": "stevens"})
+        self.assertContains(response, "Busiest Day And Hour (All Time, All Regions)")
+        self.assertContains(response, "Friday, 22:00")
+
+
+class ComparisonMatrixTests(CacheClearingTestCase):
+    def cells(self, region_id):
+        return {
+            cell["month"]: cell
+            for row in get_comparison_matrix(region_id)
+            for cell in row["months"]
+            if cell
+        }
+
+    def test_deltas_against_previous_month_and_last_year(self):
+        region_id = get_region().id
+        year = date.today().year
+        for moment, count in (
+            (datetime(year - 1, 1, 10), 2),
+            (datetime(year - 1, 12, 10), 1),
+            (datetime(year, 1, 10), 3),
+        ):
+            for _ in range(count):
+                make_incident(datetime=moment, narcan_doses_administered=2)
+        cells = self.cells(region_id)
+        january = cells[f"{year}-01"]["incidents"]
+        self.assertEqual(january["value"], 3)
+        self.assertEqual(january["mom"], {"delta": 2, "percent": 200.0})
+        self.assertEqual(january["yoy"], {"delta": 1, "percent": 50.0})
+        self.assertEqual(cells[f"{year}-01"]["narcan"]["value"], 6)
+        # a month without incidents counts as zero, with no percentage from zero
+        self.assertEqual(cells[f"{year - 1}-02"]["incidents"]["value"], 0)
+        self.assertIsNone(cells[f"{year - 1}-03"]["incidents"]["mom"]["percent"])
+        # the first month has nothing to compare against
+        self.assertIsNone(cells[f"{year - 1}-01"]["incidents"]["mom"]["delta"])
+        rows = get_comparison_matrix(region_id)
+        self.assertEqual(rows[0]["totals"]["incidents"], 3)
+
+    def test_recomputed_after_an_affected_month_changes(self):
+        region_id = get_region().id
+        key = f"{date.today():%Y-%m}"
+        make_incident()
+        self.assertEqual(self.cells(region_id)[key]["incidents"]["value"], 1)
+        # only the catalogue version is read on a hit
+        with self.assertNumQueries(1):
+            get_comparison_matrix(region_id)
+        make_incident()
+        self.assertEqual(self.cells(region_id)[key]["incidents"]["value"], 2)
+
+    def test_api(self):
+        self.client.force_login(User.objects.create_user("viewer", password="pw"))
+        make_incident()
+        response = self.client.get("/api/compare/")
+        self.assertEqual(response.json()["region"], "spokane")
+        self.assertEqual(
+            response.json()["metrics"], ["incidents", "fatalities", "narcan"]
+        )
+        self.assertEqual(self.client.get("/compare/").status_code, 200)
+
+
+class SvgChartTests(SimpleTestCase):
+    def test_nice_ticks(self):
+        self.assertEqual(nice_ticks(0), [0, 1])
+        self.assertEqual(nice_ticks(-3), [0, 1])
+        self.assertEqual(nice_ticks(3), [0, 1, 2, 3])
+        self.assertEqual(nice_ticks(8), [0, 2, 4, 6, 8])
+        self.assertEqual(nice_ticks(47), [0, 10, 20, 30, 40, 50])
+        self.assertEqual(nice_ticks(0.3), [0, 0.1, 0.2, 0.3])
+        for maximum in (1, 7, 13, 99, 101, 2500, 0.45):
+            ticks = nice_ticks(maximum)
+            self.assertGreaterEqual(ticks[-1], maximum)
+            self.assertLessEqual(len(ticks), 11)
+
+    def test_render_bar_chart(self):
+        svg = render_bar_chart(
+            ["Mon", "Tue", "<Wed>"],
+            [2, 0, 5],
+            "Incidents & Days",
+            "Total Incidents",
+            chart_id="test-chart",
+        )
+        self.assertTrue(svg.startswith('<svg xmlns="http://www.w3.org/2000/svg"'))
+        self.assertTrue(svg.endswith("</svg>"))
+        self.assertIn('id="test-chart"', svg)
+        self.assertIn('<title id="test-chart-title">Incidents &amp; Days</title>', svg)
+        # zero bars are left out, every category keeps its axis label
+        self.assertEqual(svg.count("<rect"), 2)
+        self.assertIn("<title>&lt;Wed&gt;: 5</title>", svg)
+        self.assertNotIn("<Wed>", svg)
+        self.assertIn("highest value 5", svg)
+
+    def test_render_empty_chart(self):
+        svg = render_bar_chart([], [], "Empty", "Total Incidents")
+        self.assertNotIn("<rect", svg)
+        self.assertIn("from none to none", svg)
+
+    def test_long_daily_series_is_binned(self):
+        days = [date(2022, 1, 3) + timedelta(days=offset) for offset in range(1500)]
+        period, labels, totals = bin_daily_totals(days, [1] * len(days))
+        self.assertEqual(period, "Month")
+        self.assertEqual(labels[:2], ["Jan 2022", "Feb 2022"])
+        self.assertEqual(sum(totals), 1500)
+        self.assertLessEqual(len(labels), max_bars())
+        period, labels, totals = bin_daily_totals(days[:400], [2] * 400)
+        self.assertEqual(period, "Week")
+        self.assertEqual(labels[0], "Jan 03 2022")
+        self.assertEqual(totals[0], 14)
+        self.assertEqual(sum(totals), 800)
+        period, labels, totals = bin_daily_totals(days[:31], list(range(31)))
+        self.assertEqual(
+            (period, labels[0], totals), ("Day", "Jan 03", list(range(31)))
+        )
+
+
+class AnalyticsSummaryCacheTests(CacheClearingTestCase):
+    def test_report_written_elsewhere_is_seen(self):
+        self.assertEqual(analytics.get_analytics_summary(), {})
+        # written without touching this process's cache, as the report
+        # command running in another process does
+        AnalyticsSummary.objects.create(metric="top_location", value=3)
+        self.assertEqual(list(analytics.get_analytics_summary()), ["top_location"])
+        AnalyticsSummary.objects.all().delete()
+        self.assertEqual(analytics.get_analytics_summary(), {})
+
+    def test_cached_summary_costs_one_version_query(self):
+        AnalyticsSummary.objects.create(metric="top_location", value=3)
+        analytics.get_analytics_summary()
+        with self.assertNumQueries(1):
+            analytics.get_analytics_summary()
+
+
+@skipUnless(analytics.pd is not None, "analytics reports need pandas")
+class AnalyticsPartialsTests(SimpleTestCase):
+    def rows(self, month, count, seed):
+        rng = np.random.default_rng(seed)
+        return [
+            (
+                datetime(2026, month, 1 + index % 28, index % 24, 0),
+                f"{index % 3} Main St",
+                int(rng.integers(1, 4)),
+                None if index % 7 == 0 else int(rng.integers(0, 5)),
+                bool(rng.random() < 0.2),
+            )
+            for index in range(count)
+        ]
+
+    def test_month_partials(self):
+        from .analytics_partials import summarize_month
+
+        rows = self.rows(3, 40, seed=1)
+        partials = summarize_month("2026-03", rows)
+        self.assertEqual(partials["hour_weekday"]["incidents"].sum(), 40)
+        self.assertEqual(
+            partials["hour_weekday"]["affected"].sum(), sum(row[2] for row in rows)
+        )
+        locations = partials["location_month"]
+        self.assertEqual(set(locations["month"]), {"2026-03"})
+        self.assertEqual(
+            dict(zip(locations["location"], locations["incidents"])),
+            {"0 Main St": 14, "1 Main St": 13, "2 Main St": 13},
+        )
+        by_narcan = partials["fatal_by_narcan"]
+        missing = by_narcan[by_narcan["narcan"] == -1]["incidents"].sum()
+        self.assertEqual(missing, sum(1 for row in rows if row[3] is None))
+
+    def test_merged_moments_match_a_direct_correlation(self):
+        from .analytics_partials import summarize_month
+
+        rows = self.rows(3, 60, seed=2) + self.rows(4, 45, seed=3)
+        moments = analytics.pd.concat(
+            [
+                summarize_month("2026-03", rows[:60])["moments"],
+                summarize_month("2026-04", rows[60:])["moments"],
+            ]
+        )
+        correlations = analytics.correlations_from_moments(moments)
+        result = correlations[
+            (correlations["a"] == "number_affected") & (correlations["b"] == "narcan")
+        ].iloc[0]
+        pairs = np.array([(row[2], row[3]) for row in rows if row[3] is not None])
+        self.assertEqual(result["n"], len(pairs))
+        self.assertAlmostEqual(
+            result["r"], np.corrcoef(pairs[:, 0], pairs[:, 1])[0, 1], places=10
+        )
@@ -0,0 +1,231 @@
+"""Rolling trend statistics for the dashboard.
+
+Daily overdose totals are folded into a TrendStats object holding 7/30/90
+day rolling sums, an exponentially weighted moving average and a Holt
+(level + trend) model. The daily totals live in `DailyTotal`, one row per
+region and day: single incident writes adjust their day's row with F()
+deltas in O(1), and bulk writes recount the affected months.
+
+A read folds only the last `max(WINDOWS)` days from that rollup, never
+the incident tables or the archive. Older days carry a weight of at most
+(1 - EWMA_ALPHA) ** 90 in the EWMA, and Holt replays that many days
+anyway, so the result matches a fold over the whole history.
+"""
+
+import math
+from collections import deque
+from datetime import date, timedelta
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import TruncDate
+
+from .models import DailyTotal
+from .month_index import month_bounds, month_start
+from .regions import get_region_ids
+from .storage import group_incidents, incident_querysets
+
+WINDOWS = (7, 30, 90)
+EWMA_ALPHA = 0.2
+HOLT_ALPHA = 0.3
+HOLT_BETA = 0.1
+# Holt forgets old data quickly, so it only replays this many days
+HOLT_WARMUP_DAYS = 90
+
+
+class TrendStats:
+    def __init__(self):
+        # `current_day` is still open; `recent` holds the closed days before it
+        self.current_day = None
+        self.current_total = 0
+        self.recent = deque(maxlen=max(WINDOWS))
+        self.window_sums = {window: 0 for window in WINDOWS}
+        self.days_closed = 0
+        self.ewma = None
+        self.level = None
+        self.trend = 0.0
+
+    def _close_day(self, total):
+        for window in WINDOWS:
+            if len(self.recent) >= window:
+                self.window_sums[window] -= self.recent[-window]
+            self.window_sums[window] += total
+        self.recent.append(total)
+        self.days_closed += 1
+
+        if self.ewma is None:
+            self.ewma = float(total)
+        else:
+            self.ewma += EWMA_ALPHA * (total - self.ewma)
+
+        if self.level is None:
+            self.level = float(total)
+        else:
+            previous_level = self.level
+            self.level = HOLT_ALPHA * total + (1 - HOLT_ALPHA) * (
+                self.level + self.trend
+            )
+            self.trend = HOLT_BETA * (self.level - previous_level) + (
+                1 - HOLT_BETA
+            ) * self.trend
+
+    def advance_to(self, day):
+        if self.current_day is None:
+            self.current_day = day
+            return True
+        if day <= self.current_day:
+            return False
+        while self.current_day < day:
+            self._close_day(self.current_total)
+            self.current_total = 0
+            self.current_day += timedelta(days=1)
+        return True
+
+    @classmethod
+    def from_daily_totals(cls, first_day, totals):
+        """Build the state from a zero-filled daily series ending on the open day."""
+        stats = cls()
+        if len(totals) == 0:
+            return stats
+
+        totals = np.asarray(totals, dtype=float)
+        closed = totals[:-1]
+        stats.current_day = first_day + timedelta(days=len(totals) - 1)
+        stats.current_total = int(totals[-1])
+        stats.days_closed = len(closed)
+        stats.recent.extend(int(v) for v in closed[-max(WINDOWS) :])
+        for window in WINDOWS:
+            stats.window_sums[window] = int(closed[-window:].sum())
+
+        if len(closed):
+            # ewma_n = (1-a)^(n-1) * x_0 + sum_i a * (1-a)^(n-1-i) * x_i
+            decay = np.power(1 - EWMA_ALPHA, np.arange(len(closed) - 1, -1, -1))
+            weights = EWMA_ALPHA * decay
+            weights[0] = decay[0]
+            stats.ewma = float(np.dot(weights, closed))
+
+            warmup = closed[-HOLT_WARMUP_DAYS:]
+            stats.level = float(warmup[0])
+            for total in warmup[1:].tolist():
+                previous_level = stats.level
+                stats.level = HOLT_ALPHA * total + (1 - HOLT_ALPHA) * (
+                    stats.level + stats.trend
+                )
+                stats.trend = HOLT_BETA * (stats.level - previous_level) + (
+                    1 - HOLT_BETA
+                ) * stats.trend
+        return stats
+
+    def rolling_averages(self):
+        return {
+            window: (
+                round(self.window_sums[window] / min(window, self.days_closed), 3)
+                if self.days_closed
+                else 0
+            )
+            for window in WINDOWS
+        }
+
+    def day_over_day_delta(self):
+        # compares the two most recent complete days
+        if len(self.recent) < 2:
+            return 0
+        return self.recent[-1] - self.recent[-2]
+
+    def forecast(self, steps_ahead):
+        if self.level is None:
+            return 0.0
+        return max(0.0, self.level + steps_ahead * self.trend)
+
+    def project_total(self, total_so_far, end_of_period):
+        """Project `total_so_far` forward to `end_of_period` using the Holt model."""
+        if self.current_day is None or end_of_period.date() < self.current_day:
+            return total_so_far
+        remaining_today = max(0.0, self.forecast(1) - self.current_total)
+        remaining_days = (end_of_period.date() - self.current_day).days
+        projected = total_so_far + remaining_today
+        projected += sum(self.forecast(step) for step in range(2, remaining_days + 2))
+        return math.floor(projected)
+
+    def summary(self):
+        return {
+            "rolling_averages": self.rolling_averages(),
+            "ewma": round(self.ewma, 3) if self.ewma is not None else 0,
+            "day_over_day_delta": self.day_over_day_delta(),
+            "trend_per_day": round(self.trend, 3),
+        }
+
+
+def record_delta(values, sign):
+    """Add (sign=1) or remove (sign=-1) one incident from its day's totals."""
+    day = values["datetime"].date()
+    deltas = {"incident_count": sign, "affected_total": sign * values["number_affected"]}
+    rows = DailyTotal.objects.filter(region_id=values["region_id"], day=day)
+    updated = rows.update(**{name: F(name) + delta for name, delta in deltas.items()})
+    if sign < 0:
+        rows.filter(incident_count__lte=0).delete()
+    if updated or sign < 0:
+        return
+    try:
+        with transaction.atomic():
+            DailyTotal.objects.create(region_id=values["region_id"], day=day, **deltas)
+    except IntegrityError:
+        # another writer created the row first
+        rows.update(**{name: F(name) + delta for name, delta in deltas.items()})
+
+
+def _daily_totals(querysets):
+    groups = group_incidents(
+        querysets,
+        "day",
+        TruncDate("datetime"),
+        incident_count=Count("id"),
+        affected_total=Sum("number_affected"),
+    )
+    return groups.items()
+
+
+def refresh_months(region_id, months):
+    for month in {month_start(m) for m in months if m is not None}:
+        start, end = month_bounds(month)
+        totals = _daily_totals(
+            incident_querysets(start, region_id=region_id, datetime__lt=end)
+        )
+        with transaction.atomic():
+            DailyTotal.objects.filter(
+                region_id=region_id, day__gte=start.date(), day__lt=end.date()
+            ).delete()
+            DailyTotal.objects.bulk_create(
+                DailyTotal(region_id=region_id, day=day, **values)
+                for day, values in totals
+            )
+
+
+def rebuild_daily_totals():
+    entries = [
+        DailyTotal(region_id=region_id, day=day, **values)
+        for region_id in get_region_ids()
+        for day, values in _daily_totals(incident_querysets(region_id=region_id))
+    ]
+    with transaction.atomic():
+        DailyTotal.objects.all().delete()
+        DailyTotal.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
+
+
+def get_trend_stats(region_id, today=None):
+    today = today or date.today()
+    rows = DailyTotal.objects.filter(region_id=region_id)
+    first_day = rows.aggregate(first_day=Min("day"))["first_day"]
+    if first_day is None:
+        return TrendStats()
+    first_day = max(first_day, today - timedelta(days=max(WINDOWS)))
+    by_date = dict(
+        rows.filter(day__gte=first_day).values_list("day", "affected_total")
+    )
+    last_day = max(today, max(by_date, default=today))
+    totals = np.zeros((last_day - first_day).days + 1, dtype=np.int64)
+    for day, total in by_date.items():
+        totals[(day - first_day).days] = total
+    return TrendStats.from_daily_totals(first_day, totals)
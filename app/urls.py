@@ -5,6 +5,12 @@ from . import views
 urlpatterns = [
     path("", views.home, name="home"),
     path("add_incident/", views.add_incident, name="add_incident"),
+    path("fatal/", views.fatal_incidents, name="fatal_incidents"),
+    path("compare/", views.comparison, name="comparison"),
+    path("api/changes/", views.incident_changes, name="incident_changes"),
+    path("api/incidents/", views.ingest_incidents_api, name="ingest_incidents"),
+    path("api/hotspots/", views.hotspots_api, name="hotspots"),
+    path("api/compare/", views.comparison_api, name="comparison_api"),
     path("register/", views.register_user, name="register"),
     path("logout/", views.logout_user, name="logout"),
     path("<str:time_period>/", views.home, name="home"),
@@ -1,23 +1,46 @@
 import calendar
 from datetime import date, datetime, timedelta
 import math
-from django.http import HttpResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
-from django.db.models import Sum, Max
-from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 import matplotlib.pyplot as plt
-import io, base64
+import io, base64, json
 import folium
 
-from .models import Incident
+from .models import ApiToken, HotspotCount
 from .forms import IncidentForm, RegistrationForm
-
-
-def get_incidents_map(incidents):
-    city_center = [47.655329080504096, -117.39914631901254]  # Example: San Francisco
-    m = folium.Map(location=city_center, zoom_start=12)
+from .analytics import get_analytics_summary
+from .changes import get_changes_since
+from .comparisons import METRICS, get_comparison_matrix
+from .fatalities import get_fatal_incidents_page, get_fatal_stats
+from .hotspots import get_top_hotspots
+from .ingest import MAX_BATCH_SIZE, ingest_incidents
+from .month_index import (
+    get_catalogue_version,
+    get_earliest_incident_datetime,
+    get_month_catalogue,
+    get_month_entry,
+)
+from .regions import get_region, get_region_by_id, get_regions
+from .storage import fetch_period_rows
+from .svg_charts import max_bars, render_bar_chart
+from .trends import get_trend_stats
+
+DASHBOARD_GRAPHICS_TIMEOUT = 60 * 60 * 24
+
+
+def get_incidents_map(incidents, region):
+    city_center = [region.center_latitude, region.center_longitude]
+    m = folium.Map(location=city_center, zoom_start=region.zoom)
+    if region.bounds:
+        m.fit_bounds(region.bounds)
 
     for incident in incidents:
         if incident.coordinates:
@@ -75,8 +98,6 @@ def get_incidents_per_day(incidents, time_period, earliest_incident_date, end_of
     start_date = earliest_incident_date.replace(day=1)
     end_date = now if is_current_month else end_of_month
 
-    queryset = Incident.objects.filter(id__in=[obj.id for obj in incidents])
-
     int_hours = {
         0: "12am",
         1: "1am",
@@ -105,7 +126,12 @@ def get_incidents_per_day(incidents, time_period, earliest_incident_date, end_of
     }
 
     incidents_by_int_hour = {hour: 0 for hour in range(24)}
-    for incident in queryset:
+    by_date = {}
+    for incident in incidents:
+        incident_date = incident.datetime.date()
+        by_date[incident_date] = (
+            by_date.get(incident_date, 0) + incident.number_affected
+        )
         hour_of_incident = incident.datetime.hour
         incidents_by_int_hour[hour_of_incident] += 1
 
@@ -113,14 +139,6 @@ def get_incidents_per_day(incidents, time_period, earliest_incident_date, end_of
     for key, value in incidents_by_int_hour.items():
         incidents_by_hour[int_hours[key]] = value
 
-    data = (
-        queryset.annotate(date_only=TruncDate("datetime"))
-        .values("date_only")
-        .annotate(daily_total=Sum("number_affected"))
-        .order_by("date_only")
-    )
-    by_date = {entry["date_only"]: entry["daily_total"] for entry in data}
-
     filled_data = []
     current = start_date
     while current <= end_date:
@@ -172,39 +190,44 @@ def get_highest_incident_day(incidents_per_day):
 
 
 def get_od_count_today(incidents):
-    queryset = Incident.objects.filter(id__in=[obj.id for obj in incidents])
-    return queryset.filter(datetime__date=date.today()).aggregate(
-        total_today=Sum("number_affected")
-    )["total_today"]
+    today = date.today()
+    affected_today = [
+        incident.number_affected
+        for incident in incidents
+        if incident.datetime.date() == today
+    ]
+    return sum(affected_today) if affected_today else None
 
 
 def get_ods_since_earliest_incident_date(
     incidents, earliest_incident_date, end_of_month, time_period
 ):
-    queryset = Incident.objects.filter(id__in=[obj.id for obj in incidents])
-    od_count = queryset.filter(
-        datetime__range=(earliest_incident_date, end_of_month)
-    ).aggregate(total_ods=Sum("number_affected"))["total_ods"]
-    return od_count if od_count is not None else 0
+    return sum(
+        incident.number_affected
+        for incident in incidents
+        if earliest_incident_date <= incident.datetime <= end_of_month
+    )
 
 
 def get_fatalities_since_earliest_incident_date(
     incidents, earliest_incident_date, end_of_month, time_period
 ):
-    queryset = Incident.objects.filter(id__in=[obj.id for obj in incidents])
-    return (
-        queryset.filter(datetime__range=(earliest_incident_date, end_of_month))
-        .filter(fatal_incident=True)
-        .count()
+    return sum(
+        1
+        for incident in incidents
+        if incident.fatal_incident
+        and earliest_incident_date <= incident.datetime <= end_of_month
     )
 
 
-def get_earliest_incident_date(time_period):
+def get_earliest_incident_date(time_period, region_id):
     if time_period == "all_time":
-        first_incident_on_record = Incident.objects.earliest(
-            "datetime"
-        ).datetime.replace(hour=0, minute=0, second=0, microsecond=0)
-        return first_incident_on_record
+        first_incident_on_record = get_earliest_incident_datetime(region_id)
+        if first_incident_on_record is None:
+            return get_earliest_incident_date(None, region_id)
+        return first_incident_on_record.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
     elif time_period == None:
         start_of_current_month = datetime.now().replace(
             day=1, hour=0, minute=0, second=0, microsecond=0
@@ -255,7 +278,38 @@ def get_average_time_between_ods_in_hours(
     return f"{math.floor(average_time_between_ods_in_hours)} hours, {math.floor((average_time_between_ods_in_hours % 1) * 60)} minutes"
 
 
-def get_graphic(time_period, incidents_per_day):
+def get_chart_renderer(chart):
+    return getattr(settings, "DASHBOARD_CHART_RENDERERS", {}).get(chart, "svg")
+
+
+def bin_daily_totals(days, totals, limit=None):
+    """Sum an oldest-first daily series into weeks, or months, to fit `limit` bars.
+
+    Returns the period name with the bar labels and totals; series that
+    already fit come back one bar per day.
+    """
+    limit = limit or max_bars()
+    if len(days) <= limit:
+        return "Day", [day.strftime("%b %d") for day in days], totals
+    periods = (
+        ("Week", lambda day: day - timedelta(days=day.weekday()), "%b %d %Y"),
+        ("Month", lambda day: day.replace(day=1), "%b %Y"),
+    )
+    for period, period_start, label_format in periods:
+        binned = {}
+        for day, total in zip(days, totals):
+            start = period_start(day)
+            binned[start] = binned.get(start, 0) + total
+        if len(binned) <= limit:
+            break
+    return (
+        period,
+        [start.strftime(label_format) for start in binned],
+        list(binned.values()),
+    )
+
+
+def get_graphic(time_period, incidents_per_day, renderer=None):
     now = datetime.now()
     title = (
         f"In {calendar.month_name[now.month]}"
@@ -265,6 +319,21 @@ def get_graphic(time_period, incidents_per_day):
     x = [item["date_only"] for item in incidents_per_day]
     y = [item["daily_total"] for item in incidents_per_day]
 
+    if (renderer or get_chart_renderer("per_day")) == "svg":
+        # the series arrives newest first; plot it oldest first like the PNG
+        period, labels, totals = bin_daily_totals(list(reversed(x)), list(reversed(y)))
+        return render_bar_chart(
+            labels,
+            totals,
+            f"Incidents Per {period} { title }",
+            "Total Incidents",
+            color="teal",
+            tick_step=(
+                1 if len(labels) <= 31 else {"Day": 31, "Week": 8, "Month": 6}[period]
+            ),
+            chart_id="per-day-chart",
+        )
+
     plt.figure(figsize=(8, 3.5))
     plt.bar(x, y, color="teal")
 
@@ -285,6 +354,7 @@ def get_graphic(time_period, incidents_per_day):
     # Save to a bytes buffer
     buffer = io.BytesIO()
     plt.savefig(buffer, format="png")
+    plt.close()
     buffer.seek(0)
     image_png = buffer.getvalue()
     buffer.close()
@@ -294,11 +364,22 @@ def get_graphic(time_period, incidents_per_day):
     return graphic
 
 
-def get_graphic2(time_period, incidents_by_weekday):
+def get_graphic2(time_period, incidents_by_weekday, renderer=None):
     now = datetime.now()
     x = [key for key, value in incidents_by_weekday.items()]
     y = [value[0] for key, value in incidents_by_weekday.items()]
 
+    if (renderer or get_chart_renderer("per_weekday")) == "svg":
+        return render_bar_chart(
+            x,
+            y,
+            "Incidents Per Day of Week",
+            "Total Incidents",
+            color="gray",
+            value_labels=True,
+            chart_id="per-weekday-chart",
+        )
+
     plt.figure(figsize=(8, 3.5))
     bars = plt.bar(x, y, color="gray")
 
@@ -321,6 +402,7 @@ def get_graphic2(time_period, incidents_by_weekday):
 
     buffer = io.BytesIO()
     plt.savefig(buffer, format="png")
+    plt.close()
     buffer.seek(0)
     image_png = buffer.getvalue()
     buffer.close()
@@ -329,11 +411,21 @@ def get_graphic2(time_period, incidents_by_weekday):
     return graphic
 
 
-def get_graphic3(time_period, incidents_by_hour):
+def get_graphic3(time_period, incidents_by_hour, renderer=None):
     now = datetime.now()
     x = [key for key, value in incidents_by_hour.items()]
     y = [value for key, value in incidents_by_hour.items()]
 
+    if (renderer or get_chart_renderer("per_hour")) == "svg":
+        return render_bar_chart(
+            x,
+            y,
+            "Incidents by Hour of Day",
+            "Total Incidents",
+            color="orange",
+            chart_id="per-hour-chart",
+        )
+
     plt.figure(figsize=(8, 3.5))
     plt.bar(x, y, color="orange")
 
@@ -346,6 +438,7 @@ def get_graphic3(time_period, incidents_by_hour):
     # Save to a bytes buffer
     buffer = io.BytesIO()
     plt.savefig(buffer, format="png")
+    plt.close()
     buffer.seek(0)
     image_png = buffer.getvalue()
     buffer.close()
@@ -355,28 +448,158 @@ def get_graphic3(time_period, incidents_by_hour):
     return graphic
 
 
-def get_time_range():
-    earliest_incident_on_record = Incident.objects.earliest(
-        "datetime"
-    ).datetime.replace(hour=0, minute=0, second=0, microsecond=0)
-    years = reversed(range(earliest_incident_on_record.year, datetime.now().year + 1))
+def get_time_range(region_id):
+    catalogue = get_month_catalogue(region_id)
     months = [
-        (1, "January"),
-        (2, "February"),
-        (3, "March"),
-        (4, "April"),
-        (5, "May"),
-        (6, "June"),
-        (7, "July"),
-        (8, "August"),
-        (9, "September"),
-        (10, "October"),
-        (11, "November"),
-        (12, "December"),
+        (entry.month.strftime("%Y-%m"), entry.month.strftime("%B %Y"))
+        for entry in reversed(catalogue)
     ]
+    now = datetime.now()
+    if not months or months[0][0] != now.strftime("%Y-%m"):
+        # the current month is always selectable, even before its first incident
+        months.insert(0, (now.strftime("%Y-%m"), now.strftime("%B %Y")))
+    years = sorted({entry.month.year for entry in catalogue} | {now.year}, reverse=True)
     return months, years
 
 
+def get_end_of_month(earliest_incident_date):
+    last_day = calendar.monthrange(
+        earliest_incident_date.year, earliest_incident_date.month
+    )[1]
+    return datetime(
+        earliest_incident_date.year,
+        earliest_incident_date.month,
+        last_day,
+        23,
+        59,
+        59,
+        999999,
+    )
+
+
+def get_period_incidents(
+    region_id, time_period, earliest_incident_date, end_of_month, query=None
+):
+    # the archive is only read when the period reaches back into it
+    if time_period == "all_time":
+        return fetch_period_rows(region_id, query=query)
+    return fetch_period_rows(
+        region_id, earliest_incident_date, end_of_month, query=query
+    )
+
+
+def get_period_bounds(time_period, region_id):
+    if time_period == "all_time":
+        return None, None
+    earliest_incident_date = get_earliest_incident_date(time_period, region_id)
+    return earliest_incident_date, get_end_of_month(earliest_incident_date)
+
+
+def get_dashboard_graphics_cache_key(region_id, time_period, earliest_incident_date):
+    if time_period == "all_time":
+        version = get_catalogue_version(region_id)
+    else:
+        entry = get_month_entry(
+            region_id, earliest_incident_date.year, earliest_incident_date.month
+        )
+        version = entry.updated_at.isoformat() if entry else "empty"
+    renderers = "-".join(
+        get_chart_renderer(chart) for chart in ("per_day", "per_weekday", "per_hour")
+    )
+    # the per day chart runs up to today, so a new day needs a new render
+    return (
+        f"dashboard_graphics:{region_id}:{time_period}:{date.today()}:"
+        f"{version}:{renderers}"
+    )
+
+
+def render_dashboard_graphics(
+    region,
+    time_period,
+    incidents,
+    incidents_per_day,
+    incidents_by_weekday,
+    incidents_by_hour,
+):
+    return {
+        "graph": get_graphic(time_period, incidents_per_day),
+        "graph2": get_graphic2(time_period, incidents_by_weekday),
+        "graph3": get_graphic3(time_period, incidents_by_hour),
+        "map": get_incidents_map(incidents, region),
+    }
+
+
+def get_dashboard_graphics(
+    region,
+    time_period,
+    earliest_incident_date,
+    incidents,
+    incidents_per_day,
+    incidents_by_weekday,
+    incidents_by_hour,
+    use_cache=True,
+):
+    if not use_cache:
+        return render_dashboard_graphics(
+            region,
+            time_period,
+            incidents,
+            incidents_per_day,
+            incidents_by_weekday,
+            incidents_by_hour,
+        )
+    cache_key = get_dashboard_graphics_cache_key(
+        region.id, time_period, earliest_incident_date
+    )
+    graphics = cache.get(cache_key)
+    if graphics is None:
+        graphics = render_dashboard_graphics(
+            region,
+            time_period,
+            incidents,
+            incidents_per_day,
+            incidents_by_weekday,
+            incidents_by_hour,
+        )
+        cache.set(cache_key, graphics, DASHBOARD_GRAPHICS_TIMEOUT)
+    return graphics
+
+
+def warm_dashboard_graphics(region_id, time_period):
+    """Render and cache a period's charts and map ahead of the next page load."""
+    region = get_region_by_id(region_id)
+    if region is None:
+        return
+    earliest_incident_date = get_earliest_incident_date(time_period, region_id)
+    end_of_month = get_end_of_month(earliest_incident_date)
+    incidents = get_period_incidents(
+        region_id, time_period, earliest_incident_date, end_of_month
+    )
+    incidents_per_day, incidents_by_weekday, incidents_by_hour = get_incidents_per_day(
+        incidents, time_period, earliest_incident_date, end_of_month
+    )
+    cache.set(
+        get_dashboard_graphics_cache_key(region_id, time_period, earliest_incident_date),
+        render_dashboard_graphics(
+            region,
+            time_period,
+            incidents,
+            incidents_per_day,
+            incidents_by_weekday,
+            incidents_by_hour,
+        ),
+        DASHBOARD_GRAPHICS_TIMEOUT,
+    )
+
+
+def get_request_region(request):
+    # a region picked once sticks for the rest of the session
+    region = get_region(request.GET.get("region") or request.session.get("region"))
+    if region is not None and request.session.get("region") != region.slug:
+        request.session["region"] = region.slug
+    return region
+
+
 def home(request, time_period=None, query=None):
     if request.method == "POST":
         username = request.POST["username"]
@@ -397,45 +620,42 @@ def home(request, time_period=None, query=None):
         query = request.GET.get("query", None)
         print("query:", query)
 
+        region = get_request_region(request)
+
         # if time_period is not provided, will return the 1st of the current month
-        earliest_incident_date = get_earliest_incident_date(time_period)
+        earliest_incident_date = get_earliest_incident_date(time_period, region.id)
+        if time_period not in ("all_time", current_month) and (
+            get_month_entry(
+                region.id, earliest_incident_date.year, earliest_incident_date.month
+            )
+            is None
+        ):
+            months, years = get_time_range(region.id)
+            return render(
+                request,
+                "month_not_found.html",
+                {
+                    "missing_month": earliest_incident_date.date,
+                    "months": months,
+                    "years": years,
+                    "region": region,
+                    "regions": get_regions(),
+                },
+                status=404,
+            )
         print(earliest_incident_date)
-        last_day = calendar.monthrange(
-            earliest_incident_date.year, earliest_incident_date.month
-        )[1]
-        end_of_month = datetime(
-            earliest_incident_date.year,
-            earliest_incident_date.month,
-            last_day,
-            23,
-            59,
-            59,
-            999999,
-        )
+        end_of_month = get_end_of_month(earliest_incident_date)
         print(end_of_month)
 
         time_span = earliest_incident_date.date()
 
-        if time_period == "all_time":
-            incidents = Incident.objects.all()
-        elif time_period == current_month:
-            incidents = Incident.objects.filter(
-                datetime__year=earliest_incident_date.year,
-                datetime__month=earliest_incident_date.month,
-            )
-        else:
-            incidents = Incident.objects.filter(
-                datetime__range=(earliest_incident_date, end_of_month)
-            )
-
         # filter for 'search'
         print("query:", query)
-        if query is not None:
-            print("this runs")
-            incidents = incidents.filter(location__icontains=query)
-
-        print("Here it is: ", incidents)
-        incidents = enumerate_incidents(list(incidents.order_by("datetime")))
+        incidents = enumerate_incidents(
+            get_period_incidents(
+                region.id, time_period, earliest_incident_date, end_of_month, query
+            )
+        )
 
         sort_order = request.GET.get("sort", "desc")
         sort_incidents(incidents, sort_order)
@@ -502,13 +722,39 @@ def home(request, time_period=None, query=None):
             OD_count_since_earliest_incident_date,
         )
 
-        graphic1 = get_graphic(time_period, incidents_per_day)
-        graphic2 = get_graphic2(time_period, incidents_by_weekday)
-        graphic3 = get_graphic3(time_period, incidents_by_hour)
+        # the rolling trends describe recent days, not a past month or a search
+        trend_stats = (
+            get_trend_stats(region.id)
+            if time_period == current_month and query is None
+            else None
+        )
+        trend_projected_end_of_month_total = (
+            trend_stats.project_total(
+                OD_count_since_earliest_incident_date, end_of_month
+            )
+            if trend_stats is not None
+            else None
+        )
 
-        months, years = get_time_range()
+        fatal_stats = get_fatal_stats(region.id)
 
-        map = get_incidents_map(incidents)
+        top_locations = get_top_hotspots(
+            region.id, *get_period_bounds(time_period, region.id)
+        )
+
+        graphics = get_dashboard_graphics(
+            region,
+            time_period,
+            earliest_incident_date,
+            incidents,
+            incidents_per_day,
+            incidents_by_weekday,
+            incidents_by_hour,
+            # search results are one-off, so only whole periods are cached
+            use_cache=query is None,
+        )
+
+        months, years = get_time_range(region.id)
 
         return render(
             request,
@@ -527,22 +773,196 @@ def home(request, time_period=None, query=None):
                 "one_fatal_incident_every_x_days_str": one_fatal_incident_every_x_days_str,
                 "average_time_between_ods_in_hours_str": average_time_between_ods_in_hours_str,
                 "projected_end_of_month_total": projected_end_of_month_total,
+                "trend_projected_end_of_month_total": trend_projected_end_of_month_total,
+                "trends": trend_stats.summary() if trend_stats is not None else None,
+                "most_recent_fatal_incident": fatal_stats["most_recent"],
+                "days_since_last_fatality": fatal_stats["days_since_last_fatality"],
+                "analytics": get_analytics_summary(),
+                "top_locations": top_locations,
                 "incidents_per_day": incidents_per_day,
                 "incidents_by_weekday": incidents_by_weekday,
                 "incidents_by_hour": incidents_by_hour,
                 "highest_incident_date_this_month": highest_incident_date_this_month,
                 "most_in_single_day_this_month": most_in_single_day_this_month,
-                "graph": graphic1,
-                "graph2": graphic2,
-                "graph3": graphic3,
+                "graph": graphics["graph"],
+                "graph2": graphics["graph2"],
+                "graph3": graphics["graph3"],
+                "graph_formats": {
+                    "graph": get_chart_renderer("per_day"),
+                    "graph2": get_chart_renderer("per_weekday"),
+                    "graph3": get_chart_renderer("per_hour"),
+                },
                 "months": months,
                 "years": years,
-                "map": map,
+                "map": graphics["map"],
                 "query": query,
+                "region": region,
+                "regions": get_regions(),
             },
         )
 
 
+def fatal_incidents(request):
+    if not request.user.is_authenticated:
+        messages.warning(request, "Log in to view fatal incidents")
+        return redirect("home")
+    region = get_request_region(request)
+    incidents, next_cursor = get_fatal_incidents_page(
+        region.id, request.GET.get("before")
+    )
+    return render(
+        request,
+        "fatal.html",
+        {
+            "incidents": incidents,
+            "next_cursor": next_cursor,
+            "is_first_page": "before" not in request.GET,
+            "fatal_stats": get_fatal_stats(region.id),
+            "region": region,
+        },
+    )
+
+
+def comparison(request):
+    if not request.user.is_authenticated:
+        messages.warning(request, "Log in to compare periods")
+        return redirect("home")
+    region = get_request_region(request)
+    metric = request.GET.get("metric", "incidents")
+    if metric not in METRICS:
+        metric = "incidents"
+    # the template can't index by a variable key, so pick the metric here
+    rows = [
+        {
+            "year": row["year"],
+            "total": row["totals"][metric],
+            "months": [cell and cell[metric] for cell in row["months"]],
+        }
+        for row in reversed(get_comparison_matrix(region.id))
+    ]
+    return render(
+        request,
+        "compare.html",
+        {
+            "rows": rows,
+            "metric": metric,
+            "metrics": list(METRICS),
+            "month_names": calendar.month_abbr[1:],
+            "region": region,
+        },
+    )
+
+
+def get_api_user(request, allow_session=True):
+    if allow_session and request.user.is_authenticated:
+        return request.user
+    scheme, _, key = request.headers.get("Authorization", "").partition(" ")
+    if scheme != "Bearer" or not key:
+        return None
+    token = (
+        ApiToken.objects.select_related("user")
+        .filter(key=key.strip(), is_active=True, user__is_active=True)
+        .first()
+    )
+    if token is None:
+        return None
+    ApiToken.objects.filter(pk=token.pk).update(last_used_at=timezone.now())
+    return token.user
+
+
+def get_api_region(request):
+    # unlike the pages, the API doesn't fall back from a slug it doesn't know
+    slug = request.GET.get("region")
+    region = get_region(slug)
+    if region is None or (slug and region.slug != slug):
+        return None
+    return region
+
+
+def incident_changes(request):
+    if get_api_user(request) is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    try:
+        since = int(request.GET.get("since", 0))
+        limit = int(request.GET.get("limit", 500))
+    except ValueError:
+        return JsonResponse({"error": "since and limit must be integers"}, status=400)
+    return JsonResponse(get_changes_since(since, limit))
+
+
+def hotspots_api(request):
+    if get_api_user(request) is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    region = get_api_region(request)
+    if region is None:
+        return JsonResponse({"error": "Unknown region"}, status=404)
+    time_period = request.GET.get("time_period", "all_time")
+    kind = request.GET.get("by", HotspotCount.LOCATION)
+    if kind not in (HotspotCount.LOCATION, HotspotCount.CELL):
+        return JsonResponse({"error": 'by must be "location" or "cell"'}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), 100))
+        since, until = get_period_bounds(time_period, region.id)
+    except ValueError:
+        return JsonResponse(
+            {"error": "limit must be an integer and time_period all_time or YYYY-MM"},
+            status=400,
+        )
+    return JsonResponse(
+        {
+            "region": region.slug,
+            "time_period": time_period,
+            "by": kind,
+            "hotspots": get_top_hotspots(region.id, since, until, kind, limit),
+        }
+    )
+
+
+def comparison_api(request):
+    if get_api_user(request) is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    region = get_api_region(request)
+    if region is None:
+        return JsonResponse({"error": "Unknown region"}, status=404)
+    return JsonResponse(
+        {
+            "region": region.slug,
+            "metrics": list(METRICS),
+            "years": get_comparison_matrix(region.id),
+        }
+    )
+
+
+# token-only, so a logged-in browser session can't be used to forge submissions
+@csrf_exempt
+@require_POST
+def ingest_incidents_api(request):
+    user = get_api_user(request, allow_session=False)
+    if user is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    if not user.has_perm("app.add_incident"):
+        return JsonResponse({"error": "Permission denied"}, status=403)
+    try:
+        body = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Request body must be JSON"}, status=400)
+    items = body.get("incidents") if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        return JsonResponse(
+            {"error": 'Send a JSON array of incidents or {"incidents": [...]}'},
+            status=400,
+        )
+    if len(items) > MAX_BATCH_SIZE:
+        return JsonResponse(
+            {"error": f"At most {MAX_BATCH_SIZE} incidents per request"}, status=413
+        )
+    results = ingest_incidents(items)
+    counts = {"created": 0, "duplicate": 0, "invalid": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return JsonResponse({**counts, "results": results})
+
+
 def add_incident(request):
     if request.method == "POST":
         form = IncidentForm(request.POST)
@@ -111,6 +111,39 @@ USE_TZ = False
 
 STATIC_URL = "static/"
 
+# Set CACHE_BACKEND (and CACHE_LOCATION) to a cache shared by the web
+# processes and the run_jobs worker, which warms it, e.g.
+# django.core.cache.backends.filebased.FileBasedCache; unset keeps Django's
+# default per-process cache
+if os.getenv("CACHE_BACKEND"):
+    CACHES = {
+        "default": {
+            "BACKEND": os.getenv("CACHE_BACKEND"),
+            "LOCATION": os.getenv("CACHE_LOCATION", ""),
+        }
+    }
+
+# Run queued jobs immediately in the request instead of in run_jobs
+JOBS_RUN_INLINE = os.getenv("JOBS_RUN_INLINE", "") == "1"
+
+# The change feed holds back changes recorded within this many seconds,
+# which must exceed the longest write transaction
+CHANGE_FEED_SETTLE_SECONDS = int(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "30"))
+
+# Slug of the region used when a request or submission doesn't name one
+DEFAULT_REGION = os.getenv("DEFAULT_REGION", "spokane")
+
+# Whole months older than this are moved to the archive table by
+# `manage.py archive_incidents`; the current month is always hot
+INCIDENT_ARCHIVE_AFTER_MONTHS = int(os.getenv("INCIDENT_ARCHIVE_AFTER_MONTHS", "24"))
+
+# Dashboard charts: "svg" renders inline SVG, "png" uses matplotlib
+DASHBOARD_CHART_RENDERERS = {
+    "per_day": "svg",
+    "per_weekday": "svg",
+    "per_hour": "svg",
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 